@@ -0,0 +1,192 @@
+"""Assignment 2 - Blocky
+
+=== Module Description ===
+
+This file contains the AsyncGame class, a Game driven by an asyncio event
+loop so that the window never stops responding.
+
+Every move is awaited.  A computer player chooses its move (see the
+choose_move method of the computer players) on a copy of the board in a
+worker thread, while the event loop keeps drawing the board and handling
+the window's events at a steady frame rate; the pause that lets the user
+see the chosen block before it moves is spent drawing frames as well.  A
+human player's input is polled once per frame instead of in a busy loop.
+Closing the window ends the game at once, even while a computer player is
+still thinking.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+import pygame
+from game import Game
+from player import Player, HumanPlayer, TIME_DELAY
+from renderer import NullRenderer
+
+# The default number of frames drawn per second.
+FRAME_RATE = 30
+
+
+class AsyncGame(Game):
+    """A game of Blocky played on an asyncio event loop.
+
+    === Public Attributes ===
+    frame_rate:
+        The number of times per second the board is drawn and the window's
+        events are handled while a move is being made.
+
+    === Representation Invariants ===
+    - frame_rate >= 1
+    """
+    # === Private Attributes ===
+    # _headless:
+    #     True iff the game has no window, in which case no frames are drawn
+    #     and the moves are awaited directly.
+    # _executor:
+    #     The worker threads of the computer players, or None outside of
+    #     run_game_async.
+    frame_rate: int
+    _headless: bool
+    _executor: Optional[ThreadPoolExecutor]
+
+    def __init__(self, max_depth: int,
+                 num_human: int,
+                 random_players: int,
+                 smart_players: List[int],
+                 headless: bool = False,
+                 journal_path: Optional[str] = None,
+                 history_size: int = 50,
+                 frame_rate: int = FRAME_RATE) -> None:
+        """Initialize this game as described in Game, drawn at <frame_rate>
+        frames per second.
+
+        Precondition:
+            2 <= max_depth <= 5
+            num_human == 0 if headless is True
+            frame_rate >= 1
+        """
+        super().__init__(max_depth, num_human, random_players, smart_players,
+                         headless, journal_path, history_size)
+        self.frame_rate = frame_rate
+        self._headless = isinstance(self.renderer, NullRenderer)
+        self._executor = None
+
+    def run_game(self, num_turns: int, verbose: bool = True) -> List[int]:
+        """Run the game for the number of turns specified on a new event
+        loop, as described in Game.run_game.
+        """
+        return asyncio.run(self.run_game_async(num_turns, verbose))
+
+    async def run_game_async(self, num_turns: int,
+                             verbose: bool = True) -> List[int]:
+        """Run the game for the number of turns specified, as described in
+        Game.run_game, awaiting every move.
+        """
+        self.move_times = []
+        self._executor = ThreadPoolExecutor(1)
+        # Index within self.players of the current player.
+        index = 0
+        try:
+            for turn in range(num_turns * len(self.players)):
+                player = self.players[index]
+                if verbose:
+                    print(f'Player {player.id}, turn {turn}')
+                start = time.perf_counter()
+                if isinstance(player, HumanPlayer):
+                    result = await self._human_move(player)
+                else:
+                    result = await self._computer_move(player)
+                if result == 1:
+                    break
+                self._end_turn(player, start, verbose)
+                index = (index + 1) % len(self.players)
+        finally:
+            # a computer player still thinking when the window was closed
+            # is left to finish on its own
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+        return self._end_game(verbose)
+
+    async def _frame(self, player: Player) -> bool:
+        """Draw the board for the turn of <player>, handle the window's
+        events and wait until the next frame is due.
+
+        Return True iff the window was closed.
+        """
+        self.renderer.draw(self.board, player.id)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return True
+        await asyncio.sleep(1 / self.frame_rate)
+        return False
+
+    async def _human_move(self, player: HumanPlayer) -> int:
+        """Wait for <player> to make a move, polling its input once per frame.
+
+        Return 0 upon successful completion of a move, and 1 upon a QUIT event.
+        """
+        player.start_turn(self.board)
+        while True:
+            self.renderer.draw(self.board, player.id)
+            result = player.poll(self.board)
+            if result is not None:
+                return result
+            await asyncio.sleep(1 / self.frame_rate)
+
+    async def _computer_move(self, player: Player) -> int:
+        """Let the computer <player> choose its move on a copy of the board
+        in a worker thread while frames are drawn, then show the chosen
+        block for TIME_DELAY milliseconds and make the move.
+
+        Return 0 upon successful completion of a move, and 1 upon a QUIT event.
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.run_in_executor(self._executor, player.choose_move,
+                                      self.board.copy())
+        if not self._headless:
+            while not future.done():
+                if await self._frame(player):
+                    return 1
+        move = await future
+        if move is None:
+            # a board that is a single unit cell has nothing to move
+            player.last_move = None
+            return 0
+
+        path, decider = move
+        block = self.board.get_block(path)
+        if not self._headless:
+            block.highlighted = True
+            deadline = time.perf_counter() + TIME_DELAY / 1000
+            while time.perf_counter() < deadline:
+                if await self._frame(player):
+                    block.highlighted = False
+                    return 1
+            block.highlighted = False
+        player.record_move(block, decider)
+        self.renderer.draw(self.board, player.id)
+        return 0
+
+
+def auto_game(headless: bool = False) -> None:
+    """Run a game with two computer players of different difficulty on an
+    event loop.
+
+    If <headless> is True, run it without a window, as fast as possible.
+    """
+    game = AsyncGame(4, 0, 0, [1, 2], headless)
+    game.run_game(20)
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'allowed-io': ['run_game_async'],
+        'allowed-import-modules': [
+            'doctest', 'python_ta', 'typing', 'time', 'asyncio',
+            'concurrent.futures', 'pygame', 'game', 'player', 'renderer'
+        ]
+    })
+    auto_game()
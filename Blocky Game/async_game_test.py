@@ -0,0 +1,49 @@
+"""Assignment 2 - Blocky: AsyncGame tests
+
+=== Module Description ===
+
+This file contains tests for async_game.py.
+"""
+import os
+import random
+import pygame
+from async_game import AsyncGame
+from player import RandomPlayer, SmartPlayer
+from simple_test import equal_boards
+
+
+def test_choose_move_leaves_board() -> None:
+    """Choosing a move doesn't change the board, and the chosen move is the
+    one make_move would make."""
+    random.seed(148)
+    game = AsyncGame(3, 0, 1, [2], headless=True)
+    for player in game.players:
+        before = game.board.copy()
+        state = random.getstate()
+        move = player.choose_move(game.board)
+        assert equal_boards(game.board, before)
+        random.setstate(state)
+        player.make_move(game.board)
+        assert player.last_move[:2] == move
+
+
+def test_headless_async_game() -> None:
+    """A headless game on the event loop plays every turn."""
+    random.seed(1001)
+    game = AsyncGame(4, 0, 1, [1, 3], headless=True)
+    scores = game.run_game(3, verbose=False)
+    assert len(scores) == 3
+    assert [player_id for player_id, _ in game.move_times] == [0, 1, 2] * 3
+    assert isinstance(game.players[0], RandomPlayer)
+    assert isinstance(game.players[1], SmartPlayer)
+
+
+def test_quit_while_thinking() -> None:
+    """Closing the window ends the game even while a computer player is
+    thinking."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    random.seed(1001)
+    game = AsyncGame(4, 0, 0, [5], frame_rate=100)
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+    game.run_game(5, verbose=False)
+    assert game.move_times == []
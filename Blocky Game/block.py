@@ -10,7 +10,7 @@ University of Toronto
 
 This file contains the Block class, the main data structure used in the game.
 """
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Dict
 import random
 import math
 from renderer import COLOUR_LIST, TEMPTING_TURQUOISE, BLACK, colour_name
@@ -48,6 +48,12 @@ class Block:
         lower-left child, lower-right child.
     parent:
         The block that this block is directly within.
+    node_index:
+        If this is the top-level block and its blocks have been indexed for
+        sampling, the BlockIndex of this board.  Otherwise None.
+    history:
+        If this is the top-level block and the moves made on it are being
+        recorded, the MoveHistory of this board.  Otherwise None.
 
     === Representation Invariations ===
     - len(children) == 0 or len(children) == 4
@@ -70,6 +76,8 @@ class Block:
     highlighted: bool
     children: List['Block']
     parent: Optional['Block']
+    node_index: Optional['BlockIndex']
+    history: Optional['MoveHistory']
 
     def __init__(self, level: int,
                  colour: Optional[Tuple[int, int, int]] = None,
@@ -97,6 +105,8 @@ class Block:
         self.max_depth = 0
         self.highlighted = False
         self.parent = None
+        self.node_index = None
+        self.history = None
 
     def rectangles_to_draw(self) -> List[Tuple[Tuple[int, int, int],
                                                Tuple[int, int],
@@ -238,7 +248,7 @@ class Block:
         self.update_block_locations(self.position, self.size)
         # Update the position and size of each of the Blocks within this Block.
 
-    def smash(self) -> bool:
+    def smash(self, seed: Optional[int] = None) -> bool:
         """Smash this block.
 
         If this Block can be smashed,
@@ -246,6 +256,10 @@ class Block:
         had child Blocks, discard them.)
         Ensure that the RI's of the Blocks remain satisfied.
 
+        If <seed> is not None, the new child Blocks are generated by a
+        random.Random seeded with it, so that smashing with the same seed
+        always gives the same children.
+
         A Block can be smashed iff it is not the top-level Block and it
         is not already at the level of the maximum depth.
 
@@ -257,22 +271,68 @@ class Block:
             # will change the entire game
             return False
 
-        elif len(self.children) != 0:
-            # if it has children discard them first
-            self.children.clear()
-
+        rng = None if seed is None else random.Random(seed)
+        new_children = []
         for _ in range(4):
             # creating 4 new block with the level: self.level + 1 to add it to
             # the children of the block that we are smashing
             # (creating 4 new block as children for the block that we're
             # smashing)
-            new_block = random_init(self.level + 1, self.max_depth)
-            new_block.parent = self
-            self.children.append(new_block)
+            new_children.append(random_init(self.level + 1, self.max_depth,
+                                            rng))
+
+        self.replace_children(new_children)
+        # discard the old children (if it had any) and use the new ones
+        return True
+
+    def replace_children(self, children: List['Block'],
+                         colour: Optional[Tuple[int, int, int]] = None) \
+            -> None:
+        """Replace the children of this Block with <children>, discarding the
+        old ones.
+
+        If <children> is empty this Block becomes a solid block of <colour>.
+        The new children get this Block as their parent and their positions
+        and sizes are updated.  If the board containing this Block has a
+        BlockIndex, it is kept up to date.
+
+        Precondition: len(children) == 0 or len(children) == 4, and the
+        children have the levels and max_depth required by the RI's.
+        """
+        index = self.get_root().node_index
+        if index is not None:
+            for child in self.children:
+                index.remove(child)
+
+        self.children = children
+        self.colour = colour if len(children) == 0 else None
+        for child in children:
+            child.parent = self
+            if index is not None:
+                index.add(child)
 
         self.update_block_locations(self.position, self.size)
         # Update the position and size of each of the Blocks within this Block.
-        return True
+
+    def get_path(self) -> Tuple[int, ...]:
+        """Return the path from the top-level Block of the board containing
+        this Block down to this Block, as described in get_block.
+        """
+        path = []
+        block = self
+        while block.parent is not None:
+            path.append(block.parent.children.index(block))
+            block = block.parent
+        return tuple(reversed(path))
+
+    def get_root(self) -> 'Block':
+        """Return the top-level Block of the board containing this Block, by
+        following the parent attributes.
+        """
+        block = self
+        while block.parent is not None:
+            block = block.parent
+        return block
 
     def update_block_locations(self, top_left: Tuple[int, int],
                                size: int) -> None:
@@ -401,8 +461,192 @@ class Block:
 
             return left + right
 
+    def coarse_flatten(self, resolution: int) \
+            -> List[List[Tuple[int, int, int]]]:
+        """Return a two-dimensional list representing this Block as rows and
+        columns of the cells at level <resolution>, in the same format as
+        flatten.
+
+        A cell whose block is subdivided further gets the colour that covers
+        most of its area (ties are broken in the order of COLOUR_LIST).  With
+        <resolution> equal to max_depth the result is the same as flatten.
+
+        Precondition: self.level <= resolution <= self.max_depth
+        """
+        dimension = 2 ** (resolution - self.level)
+        grid = [[None] * dimension for _ in range(dimension)]
+        self._paint(grid, 0, 0, dimension, resolution)
+        return grid
+
+    def _paint(self, grid: List[List[Optional[Tuple[int, int, int]]]],
+               column: int, row: int, size: int, resolution: int) -> None:
+        """Fill the <size> by <size> square of <grid> whose upper left cell is
+        at <column> and <row> with the colours of this Block, as described in
+        coarse_flatten.
+        """
+        if len(self.children) == 0 or self.level == resolution:
+            colour = self.colour
+            if colour is None:
+                areas = self._colour_areas()
+                colour = max(COLOUR_LIST, key=lambda c: areas.get(c, 0))
+            for i in range(column, column + size):
+                grid[i][row:row + size] = [colour] * size
+        else:
+            half = size // 2
+            # the children are in the order: upper-right, upper-left,
+            # lower-left, lower-right
+            self.children[0]._paint(grid, column + half, row, half,
+                                    resolution)
+            self.children[1]._paint(grid, column, row, half, resolution)
+            self.children[2]._paint(grid, column, row + half, half,
+                                    resolution)
+            self.children[3]._paint(grid, column + half, row + half, half,
+                                    resolution)
+
+    def _colour_areas(self) -> Dict[Tuple[int, int, int], int]:
+        """Return a dictionary mapping each colour in this Block to the number
+        of unit cells of that colour.
+        """
+        if len(self.children) == 0:
+            return {self.colour: 4 ** (self.max_depth - self.level)}
+        areas = {}
+        for child in self.children:
+            for colour, area in child._colour_areas().items():
+                areas[colour] = areas.get(colour, 0) + area
+        return areas
+
+    def copy(self) -> 'Block':
+        """Return a deep copy of this Block.
+
+        The copy has the same structure, colours, positions, sizes, levels
+        and max_depth as this Block, and its own children with their parent
+        attributes set.  It is not highlighted and has no parent.
+        """
+        if len(self.children) == 0:
+            block = Block(self.level, self.colour)
+        else:
+            block = Block(self.level, None,
+                          [child.copy() for child in self.children])
+            for child in block.children:
+                child.parent = block
+        block.position = self.position
+        block.size = self.size
+        block.max_depth = self.max_depth
+        return block
+
+    def get_block(self, path: Tuple[int, ...]) -> 'Block':
+        """Return the Block reached by following <path> down from this Block.
+
+        <path> is a sequence of child indices: path[0] is the index of the
+        child of this Block, path[1] the index of that child's child, and so
+        on.  The empty path refers to this Block itself.
+
+        Precondition: every index in <path> refers to an existing child.
+        """
+        block = self
+        for index in path:
+            block = block.children[index]
+        return block
+
+    def board_hash(self) -> int:
+        """Return a hash of the structure and colours of this Block.
+
+        Two Blocks that look the same (same subdivisions and the same colours
+        in the same places) have the same hash, regardless of their position,
+        size or highlighting.
+        """
+        return hash(self._signature())
+
+    def _signature(self) -> tuple:
+        """Return a nested tuple describing the structure and colours of this
+        Block, used by board_hash.
+        """
+        if len(self.children) == 0:
+            return self.colour
+        return tuple(child._signature() for child in self.children)
+
+
+class BlockIndex:
+    """An index of all the Blocks of a board, grouped by level, that supports
+    choosing a Block uniformly at random in constant time.
+
+    Creating a BlockIndex for a board attaches it to the board's node_index
+    attribute; from then on Block.replace_children (and so Block.smash) keeps
+    it up to date.  Rotations and swaps don't change which Blocks are on the
+    board, so they don't affect it.
+
+    === Public Attributes ===
+    levels:
+        levels[i] holds the Blocks at level i, in no particular order.
+    """
+    # === Private Attributes ===
+    # _blocks:
+    #     All the indexed Blocks, in no particular order.
+    # _where:
+    #     Maps id(block) to (position in _blocks, position in
+    #     levels[block.level]) for every indexed block, so that blocks can
+    #     be removed in constant time by moving the last block into the gap.
+    levels: List[List[Block]]
+    _blocks: List[Block]
+    _where: Dict[int, List[int]]
+
+    def __init__(self, board: Block) -> None:
+        """Index every Block of <board> and attach this index to <board>.
+
+        Precondition: <board> is a top-level Block.
+        """
+        self.levels = [[] for _ in range(board.max_depth + 1)]
+        self._blocks = []
+        self._where = {}
+        self.add(board)
+        board.node_index = self
+
+    def __len__(self) -> int:
+        """Return the number of Blocks in this index."""
+        return len(self._blocks)
+
+    def add(self, block: Block) -> None:
+        """Add <block> and all the Blocks within it to this index."""
+        self._where[id(block)] = [len(self._blocks),
+                                  len(self.levels[block.level])]
+        self._blocks.append(block)
+        self.levels[block.level].append(block)
+        for child in block.children:
+            self.add(child)
+
+    def remove(self, block: Block) -> None:
+        """Remove <block> and all the Blocks within it from this index."""
+        for child in block.children:
+            self.remove(child)
+        where = self._where.pop(id(block))
+        self._remove_at(self._blocks, where[0], 0)
+        self._remove_at(self.levels[block.level], where[1], 1)
+
+    def _remove_at(self, blocks: List[Block], position: int,
+                   slot: int) -> None:
+        """Remove the block at <position> of <blocks> by moving the last block
+        of <blocks> into its place.  <slot> is the index in the _where
+        entries that records positions in <blocks>.
+        """
+        last = blocks.pop()
+        if position < len(blocks):
+            blocks[position] = last
+            self._where[id(last)][slot] = position
+
+    def sample_block(self) -> Block:
+        """Return a Block of the board chosen uniformly at random."""
+        return random.choice(self._blocks)
+
+    def sample_level(self) -> Block:
+        """Return a Block of the board chosen by first choosing uniformly one
+        of the levels that have Blocks, and then a Block of that level.
+        """
+        levels = [blocks for blocks in self.levels if len(blocks) != 0]
+        return random.choice(random.choice(levels))
+
 
-def random_init(level: int, max_depth: int) -> 'Block':
+def random_init(level: int, max_depth: int,
+                rng: Optional[random.Random] = None) -> 'Block':
     """Return a randomly-generated Block with level <level> and subdivided
     to a maximum depth of <max_depth>.
 
@@ -410,15 +654,19 @@ def random_init(level: int, max_depth: int) -> 'Block':
     except position and size.  They can be set by the client, using method
     update_block_locations.
 
+    The random choices are made with <rng> if it is given, and with the
+    functions of the random module otherwise.
+
     Precondition:
         level <= max_depth
     """
-    if (level == max_depth) or (random.random() >= math.exp(-0.25 * level)):
+    source = random if rng is None else rng
+    if (level == max_depth) or (source.random() >= math.exp(-0.25 * level)):
         # if level == max_depth it means our block is the unit cell so it can't
         # have any children, the other statement is from handout that help us
         # to make the interesting, unpredictable board for the game
         # in this case our block doesn't have children
-        num = random.randint(0, len(COLOUR_LIST) - 1)
+        num = source.randint(0, len(COLOUR_LIST) - 1)
         colour = COLOUR_LIST[num]
         # num is the random index that determine the different colour for the
         # block
@@ -428,10 +676,10 @@ def random_init(level: int, max_depth: int) -> 'Block':
     else:
         # our block has children and doesn't have colour, and for producing the
         # children we do the recursive call on random_init
-        block = Block(level, None, [random_init(level + 1, max_depth),
-                                    random_init(level + 1, max_depth),
-                                    random_init(level + 1, max_depth),
-                                    random_init(level + 1, max_depth)])
+        block = Block(level, None, [random_init(level + 1, max_depth, rng),
+                                    random_init(level + 1, max_depth, rng),
+                                    random_init(level + 1, max_depth, rng),
+                                    random_init(level + 1, max_depth, rng)])
         block.max_depth = max_depth
         for board in block.children:  # assigning the parent to all the children
             board.parent = block
@@ -440,6 +688,63 @@ def random_init(level: int, max_depth: int) -> 'Block':
         return block
 
 
+# The byte that stands for a subdivided Block in encode_board.
+SUBDIVIDED = 255
+
+
+def encode_board(board: Block) -> bytes:
+    """Return a compact encoding of the structure and colours of <board>.
+
+    The first byte is board.max_depth, followed by one byte per Block in
+    preorder: the index of its colour in COLOUR_LIST if it is not
+    subdivided, or SUBDIVIDED if it is, followed by its children.
+
+    >>> board = Block(0, children=[Block(1, COLOUR_LIST[0]),
+    ...                            Block(1, COLOUR_LIST[1]),
+    ...                            Block(1, COLOUR_LIST[2]),
+    ...                            Block(1, COLOUR_LIST[3])])
+    >>> board.max_depth = 1
+    >>> list(encode_board(board))
+    [1, 255, 0, 1, 2, 3]
+    """
+    data = bytearray([board.max_depth])
+    stack = [board]
+    while len(stack) != 0:
+        block = stack.pop()
+        if len(block.children) == 0:
+            data.append(COLOUR_LIST.index(block.colour))
+        else:
+            data.append(SUBDIVIDED)
+            stack.extend(reversed(block.children))
+    return bytes(data)
+
+
+def decode_board(data: bytes) -> Block:
+    """Return the top-level Block encoded in <data> by encode_board.
+
+    All attributes are set except position and size, which can be set by
+    the client using method update_block_locations.
+    """
+    max_depth = data[0]
+    position = 1
+
+    def _decode(level: int) -> Block:
+        """Return the Block at level <level> encoded at <position>."""
+        nonlocal position
+        code = data[position]
+        position += 1
+        if code == SUBDIVIDED:
+            block = Block(level, None, [_decode(level + 1) for _ in range(4)])
+            for child in block.children:
+                child.parent = block
+        else:
+            block = Block(level, COLOUR_LIST[code])
+        block.max_depth = max_depth
+        return block
+
+    return _decode(0)
+
+
 def attributes_str(b: Block, verbose) -> str:
     """Return a str that is a concise representation of the attributes of <b>.
 
@@ -15,11 +15,15 @@ At the bottom of the file, there are some function that you
 can call to try playing the game in several different configurations.
 """
 import random
-from typing import List
+import time
+from typing import List, Tuple, Union, Optional
 from block import Block, random_init
 from goal import BlobGoal, PerimeterGoal
+from journal import JournalWriter
+from history import MoveHistory
 from player import Player, HumanPlayer, RandomPlayer, SmartPlayer
-from renderer import Renderer, COLOUR_LIST, colour_name, BOARD_WIDTH
+from renderer import Renderer, NullRenderer, COLOUR_LIST, colour_name, \
+    BOARD_WIDTH
 
 
 class Game:
@@ -33,26 +37,50 @@ class Game:
         and tracking user interactions with the Blocky board.
     players:
         The entities that are playing this game.
+    move_times:
+        For every move of the last call to run_game, the id of the player
+        who moved and the number of seconds the move took.
+    journal:
+        The journal recording the moves of this game, or None.
 
     === Representation Invariants ===
     - len(players) >= 1
     """
     board: Block
-    renderer: Renderer
+    renderer: Union[Renderer, NullRenderer]
     players: List[Player]
+    move_times: List[Tuple[int, float]]
+    journal: Optional[JournalWriter]
 
     def __init__(self, max_depth: int,
                  num_human: int,
                  random_players: int,
-                 smart_players: List[int]) -> None:
+                 smart_players: List[int],
+                 headless: bool = False,
+                 journal_path: Optional[str] = None,
+                 history_size: int = 50) -> None:
         """Initialize this game, as described in the Assignment 2 handout.
 
+        If <headless> is True, the game is played without a window: nothing
+        is drawn, no goals are displayed, and the computer players don't
+        pause before their moves, so the game runs as fast as it can.
+
+        If <journal_path> is not None, every move of the game is recorded in
+        a journal at that path (see journal.py).
+
+        The last <history_size> moves can be undone and redone by human
+        players (see MoveHistory); 0 turns this off.
+
         Precondition:
             2 <= max_depth <= 5
+            num_human == 0 if headless is True
         """
         self.players = []
         num_players = num_human + random_players + len(smart_players)
-        self.renderer = Renderer(num_players)
+        if headless:
+            self.renderer = NullRenderer()
+        else:
+            self.renderer = Renderer(num_players)
         decider = random.randint(0, 1)
         # the random value ( 0 or 1 ) which we use it to
         # determine the goal of the game
@@ -95,8 +123,14 @@ class Game:
         self.board.update_block_locations((0, 0), BOARD_WIDTH)
         # assigning the size and the location of the board( and its children)
         # complete the board and make it ready to play
-
-    def run_game(self, num_turns: int) -> None:
+        self.move_times = []
+        if history_size > 0:
+            MoveHistory(self.board, history_size)
+        self.journal = None
+        if journal_path is not None:
+            self.journal = JournalWriter(journal_path, self.board)
+
+    def run_game(self, num_turns: int, verbose: bool = True) -> List[int]:
         """Run the game for the number of turns specified.
 
         Each player gets <num_turns> turns. The first player in self.players
@@ -109,24 +143,55 @@ class Game:
 
         When the game is over, print who won to the console.
 
+        If <verbose> is False, print nothing at all.  Record how long each
+        move took in self.move_times, and return the final score of each
+        player, in the order of self.players.
         """
+        self.move_times = []
         # Index within self.players of the current player.
         index = 0
         for turn in range(num_turns * len(self.players)):
             player = self.players[index]
-            print(f'Player {player.id}, turn {turn}')
+            if verbose:
+                print(f'Player {player.id}, turn {turn}')
+            start = time.perf_counter()
             if self.players[index].make_move(self.board) == 1:
                 break
             else:
-                print(f'Player {player.id} CURRENT SCORE: ' +
-                      f'{player.goal.score(self.board)}')
+                self._end_turn(player, start, verbose)
                 index = (index + 1) % len(self.players)
 
+        return self._end_game(verbose)
+
+    def _end_turn(self, player: Player, start: float, verbose: bool) -> None:
+        """Record the move that <player> has just made, which began at
+        time.perf_counter() value <start>, and if <verbose> is True print
+        the player's current score.
+        """
+        self.move_times.append((player.id, time.perf_counter() - start))
+        if self.journal is not None:
+            self.journal.record(player.id, player.last_move)
+        if verbose:
+            print(f'Player {player.id} CURRENT SCORE: ' +
+                  f'{player.goal.score(self.board)}')
+
+    def _end_game(self, verbose: bool) -> List[int]:
+        """Finish the journal, and if <verbose> is True print who won and
+        the goals of the players, as described in run_game.
+
+        Return the final score of each player, in the order of self.players.
+        """
+        if self.journal is not None:
+            self.journal.close()
+
         # Determine and report the winner.
+        scores = [player.goal.score(self.board) for player in self.players]
+        if not verbose:
+            return scores
         max_score = 0
         winning_player = 0
         for i in range(len(self.players)):
-            score = self.players[i].goal.score(self.board)
+            score = scores[i]
             print(f'Player {i} : {score}')
             if score > max_score:
                 max_score = score
@@ -137,13 +202,16 @@ class Game:
             print(f'Player {player.id} ' +
                   f'goal = \n\t{player.goal.description()}: ' +
                   f'{colour_name(player.goal.colour)}')
+        return scores
 
 
-def auto_game() -> None:
+def auto_game(headless: bool = False) -> None:
     """Run a game with two computer players of different difficulty.
+
+    If <headless> is True, run it without a window, as fast as possible.
     """
     random.seed(1001)
-    game = Game(4, 0, 0, [1, 2])
+    game = Game(4, 0, 0, [1, 2], headless)
     game.run_game(20)
 
 
@@ -176,10 +244,11 @@ if __name__ == '__main__':
 
     import python_ta
     python_ta.check_all(config={
-        'allowed-io': ['run_game'],
+        'allowed-io': ['run_game', '_end_turn', '_end_game'],
         'allowed-import-modules': [
-            'doctest', 'python_ta', 'random', 'typing',
-            'block', 'goal', 'player', 'renderer'
+            'doctest', 'python_ta', 'random', 'typing', 'time',
+            'block', 'goal', 'player', 'renderer', 'journal',
+            'history'
         ],
     })
     sample_game()
@@ -40,6 +40,17 @@ class Goal:
         """
         raise NotImplementedError
 
+    def approximate_score(self, board: Block, resolution: int) -> int:
+        """Return an estimate of the current score for this goal on the given
+        board, computed on the cells at level <resolution> (see
+        Block.coarse_flatten) rather than on the unit cells.  It is exact
+        when <resolution> is at least board.max_depth, and quicker to compute
+        the lower <resolution> is.
+
+        The score is always greater than or equal to 0.
+        """
+        raise NotImplementedError
+
     def description(self) -> str:
         """Return a description of this goal.
         """
@@ -57,9 +68,25 @@ class BlobGoal(Goal):
 
         The score is always greater than or equal to 0.
         """
-        platform = board.flatten()
-        # with this we create a list[list[colour(in the tuple format)]] of the
-        # board game that make our life easier to calculate the score
+        return self._platform_score(board.flatten())
+
+    def approximate_score(self, board: Block, resolution: int) -> int:
+        """Return an estimate of the current score of the player whose goal is
+        BlobGoal on the given board, as described in Goal.approximate_score.
+
+        The score is always greater than or equal to 0.
+        """
+        resolution = min(resolution, board.max_depth)
+        cell_area = 4 ** (board.max_depth - resolution)
+        # the number of unit cells in a cell at level <resolution>
+        return self._platform_score(board.coarse_flatten(resolution)) * \
+            cell_area
+
+    def _platform_score(self, platform: List[List[Tuple[int, int, int]]]) \
+            -> int:
+        """Return the size of the largest blob of this goal's colour in
+        <platform>, a flattened board, counted in cells of <platform>.
+        """
         visited = []
         # it's the two dimention list which shows the elements that we have
         # checked from the platform
@@ -68,7 +95,7 @@ class BlobGoal(Goal):
         # 0 if it has been visited, and it is not of the target colour
         # 1 if it has been visited and is of the target colour
 
-        dimention = 2 ** board.max_depth
+        dimention = len(platform)
         # the length of the platfrom ( and also every list inside the platform))
         # the length of visited ( and also every list inside the visited ))
 
@@ -164,12 +191,30 @@ class PerimeterGoal(Goal):
 
         The score is always greater than or equal to 0.
         """
-        platform = board.flatten()
-        # with this we create a list[list[colour(in the tuple format)]] of the
-        # board game that make our life easier to calculate the score
+        return self._platform_score(board.flatten())
+
+    def approximate_score(self, board: Block, resolution: int) -> int:
+        """Return an estimate of the current score of the player whose goal is
+        PerimeterGoal on the given board, as described in
+        Goal.approximate_score.
+
+        The score is always greater than or equal to 0.
+        """
+        resolution = min(resolution, board.max_depth)
+        cell_width = 2 ** (board.max_depth - resolution)
+        # the number of unit cells along one side of a cell at level
+        # <resolution>
+        return self._platform_score(board.coarse_flatten(resolution)) * \
+            cell_width
+
+    def _platform_score(self, platform: List[List[Tuple[int, int, int]]]) \
+            -> int:
+        """Return the number of cells of this goal's colour on the perimeter
+        of <platform>, a flattened board, with the corners counted twice.
+        """
         score = 0
         # the Minimum score is Zero.
-        dimention = 2 ** board.max_depth
+        dimention = len(platform)
         # the length of the platform ( and also every list inside the platform))
         for i in range(dimention):
             if platform[i][0] == self.colour:
@@ -0,0 +1,122 @@
+"""Assignment 2 - Blocky
+
+=== Module Description ===
+
+This file contains the MoveHistory class, which lets any move made on a
+board be undone and redone, smashes included.
+"""
+from collections import deque
+from typing import Optional
+from block import Block
+from player import random_move, undo_move
+
+
+class MoveHistory:
+    """The most recent moves made on a board, which can be undone and redone.
+
+    Creating a MoveHistory for a board attaches it to the board's history
+    attribute; from then on the moves players make on the board are
+    recorded in it (see Player.record_move).
+
+    A rotation or a swap is undone by the opposite move.  A smash is undone
+    by putting back the children (or colour) it replaced, which the
+    history keeps, and redone by putting back the children it created, so
+    redoing never smashes anew.  Only the <max_moves> most recent moves are
+    kept: older ones are forgotten, together with any blocks they kept.
+
+    === Public Attributes ===
+    board:
+        the board whose moves are recorded
+    max_moves:
+        the maximum number of moves that can be undone
+    """
+    # === Private Attributes ===
+    # _undo:
+    #     the moves that can be undone, the most recent last
+    # _redo:
+    #     the undone moves that can be redone, the most recently undone last
+    #
+    # Every move is stored as a (block, decider, before, after) tuple where
+    # block and decider are as in random_move, and for a smash before and
+    # after are the (children, colour) of block before and after it.
+    board: Block
+    max_moves: int
+    _undo: deque
+    _redo: list
+
+    def __init__(self, board: Block, max_moves: int = 50) -> None:
+        """Initialize an empty history for <board> and attach it to <board>.
+
+        Precondition: <board> is a top-level Block and max_moves >= 1.
+        """
+        self.board = board
+        self.max_moves = max_moves
+        self._undo = deque(maxlen=max_moves)
+        self._redo = []
+        board.history = self
+
+    def __len__(self) -> int:
+        """Return the number of moves that can be undone."""
+        return len(self._undo)
+
+    def can_redo(self) -> bool:
+        """Return True iff there is an undone move to redo."""
+        return len(self._redo) != 0
+
+    def apply(self, block: Block, decider: int,
+              seed: Optional[int] = None) -> None:
+        """Make the move <decider> on <block>, as random_move does with
+        <seed>, and record it.  Moves that were undone can't be redone
+        anymore.
+        """
+        before = after = None
+        if decider == 4:
+            before = (block.children, block.colour)
+        random_move(decider, block, seed)
+        if decider == 4:
+            after = (block.children, block.colour)
+        self._undo.append((block, decider, before, after))
+        self._redo.clear()
+
+    def undo(self) -> bool:
+        """Undo the most recent move that has not been undone yet.
+
+        Return True if a move was undone and False if there was none.
+        """
+        if len(self._undo) == 0:
+            return False
+        move = self._undo.pop()
+        block, decider, before, _ = move
+        if decider == 4:
+            block.replace_children(before[0], before[1])
+        else:
+            undo_move(block, decider)
+        self._redo.append(move)
+        return True
+
+    def redo(self) -> bool:
+        """Make the most recently undone move again.
+
+        Return True if a move was redone and False if there was none.
+        """
+        if len(self._redo) == 0:
+            return False
+        move = self._redo.pop()
+        block, decider, _, after = move
+        if decider == 4:
+            block.replace_children(after[0], after[1])
+        else:
+            random_move(decider, block)
+        self._undo.append(move)
+        return True
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'allowed-import-modules': [
+            'doctest', 'python_ta', 'typing', 'collections',
+            'block', 'player'
+        ]
+    })
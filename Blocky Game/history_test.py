@@ -0,0 +1,84 @@
+"""Assignment 2 - Blocky: MoveHistory tests
+
+=== Module Description ===
+
+This file contains tests for history.py.
+"""
+import random
+from block import random_init, BlockIndex
+from history import MoveHistory
+from simple_test import equal_boards
+
+
+def _board(seed: int):
+    """Return a random board of depth 4 with its locations set."""
+    random.seed(seed)
+    board = random_init(0, 4)
+    board.update_block_locations((0, 0), 750)
+    return board
+
+
+def test_undo_redo_every_move() -> None:
+    """Undoing all moves, smashes included, gives back the first board, and
+    redoing them all gives back the last one."""
+    board = _board(148)
+    history = MoveHistory(board, 100)
+    boards = [board.copy()]
+    for decider in [0, 4, 2, 1, 4, 3, 4, 0]:
+        block = board
+        while len(block.children) != 0 and block.level < 2:
+            block = random.choice(block.children)
+        history.apply(block, decider, random.getrandbits(32))
+        boards.append(board.copy())
+
+    for expected in reversed(boards[:-1]):
+        assert history.undo()
+        assert equal_boards(board, expected)
+    assert not history.undo()
+    for expected in boards[1:]:
+        assert history.redo()
+        assert equal_boards(board, expected)
+    assert not history.redo()
+
+
+def test_history_is_bounded() -> None:
+    """Only the most recent max_moves moves can be undone."""
+    board = _board(1001)
+    history = MoveHistory(board, 3)
+    first = board.copy()
+    for _ in range(5):
+        history.apply(board.children[0], 4, random.getrandbits(32))
+    after_two = board.copy()
+    history.apply(board.children[1], 4, random.getrandbits(32))
+    assert len(history) == 3
+    history.undo()
+    assert equal_boards(board, after_two)
+    history.undo()
+    history.undo()
+    assert not history.undo()
+    assert not equal_boards(board, first)
+
+
+def test_new_move_clears_redo() -> None:
+    """Once a new move is made, undone moves can't be redone."""
+    board = _board(7)
+    history = MoveHistory(board)
+    history.apply(board, 0)
+    history.undo()
+    assert history.can_redo()
+    history.apply(board, 2)
+    assert not history.can_redo()
+
+
+def test_undo_smash_keeps_index() -> None:
+    """Undoing and redoing a smash keeps the board's BlockIndex correct."""
+    board = _board(2017)
+    index = BlockIndex(board)
+    history = MoveHistory(board)
+    size = len(index)
+    history.apply(board.children[2], 4, 5)
+    smashed_size = len(index)
+    history.undo()
+    assert len(index) == size
+    history.redo()
+    assert len(index) == smashed_size
@@ -0,0 +1,217 @@
+"""Assignment 2 - Blocky
+
+=== Module Description ===
+
+This file contains the move journal: a compact, append-only binary record
+of every move of a game, and the Replay class that rebuilds the board of
+any turn from it.
+
+A journal starts with a header (JOURNAL_MAGIC and a version byte) and is
+followed by records, each starting with a one byte tag:
+
+    CHECKPOINT  turn (4 bytes), length (2 bytes), board (length bytes)
+                the board after <turn> moves, as given by encode_board
+    MOVE        player id (1 byte), decider (1 byte), path length (1 byte),
+                path (2 bits per index, packed), seed (4 bytes, smash only)
+
+A MOVE with decider PASS stands for a turn that changed nothing.  The
+board is checkpointed before the first move and then every
+<checkpoint_every> moves, so seeking to a turn only replays the moves
+since the checkpoint before it.  A move that undoes or redoes another one
+(decider UNDO or REDO) is always followed by a checkpoint, so it never
+needs to be replayed.
+"""
+import struct
+from typing import List, Optional, Tuple, BinaryIO
+from block import Block, encode_board, decode_board
+from player import random_move, UNDO, REDO
+
+JOURNAL_MAGIC = b'BLKJ'
+JOURNAL_VERSION = 1
+
+CHECKPOINT = ord('C')
+MOVE = ord('M')
+
+# The decider recorded for a turn that changed nothing.
+PASS = 255
+
+
+def encode_move(player_id: int,
+                move: Optional[Tuple[Tuple[int, ...], int, Optional[int]]]) \
+        -> bytes:
+    """Return the MOVE record of <move> by the player <player_id>, where
+    <move> is in the format of Player.last_move.
+
+    >>> list(encode_move(1, ((0, 3, 2), 1, None)))
+    [77, 1, 1, 3, 44]
+    >>> len(encode_move(0, ((1,), 4, 12345)))
+    9
+    >>> list(encode_move(2, None))
+    [77, 2, 255, 0]
+    """
+    if move is None:
+        return bytes([MOVE, player_id, PASS, 0])
+    path, decider, seed = move
+    packed = bytearray((len(path) + 3) // 4)
+    for i in range(len(path)):
+        packed[i // 4] |= path[i] << (2 * (i % 4))
+    data = bytes([MOVE, player_id, decider, len(path)]) + bytes(packed)
+    if decider == 4:
+        data += struct.pack('<I', seed)
+    return data
+
+
+class JournalWriter:
+    """Writes the journal of one game.
+
+    === Public Attributes ===
+    board:
+        the board of the game being recorded
+    checkpoint_every:
+        the number of moves between two checkpoints
+    turn:
+        the number of moves recorded so far
+    """
+    # === Private Attributes ===
+    # _file:
+    #     the journal file, open for appending
+    board: Block
+    checkpoint_every: int
+    turn: int
+    _file: BinaryIO
+
+    def __init__(self, path: str, board: Block,
+                 checkpoint_every: int = 16) -> None:
+        """Start a new journal at <path> for a game on <board>, with
+        a checkpoint of <board> as it is now.
+
+        Precondition: checkpoint_every >= 1
+        """
+        self.board = board
+        self.checkpoint_every = checkpoint_every
+        self.turn = 0
+        self._file = open(path, 'wb')
+        self._file.write(JOURNAL_MAGIC + bytes([JOURNAL_VERSION]))
+        self._checkpoint()
+
+    def record(self, player_id: int,
+               move: Optional[Tuple[Tuple[int, ...], int, Optional[int]]]) \
+            -> None:
+        """Record <move>, in the format of Player.last_move, made by player
+        <player_id> on the board, and checkpoint the board if it is time.
+        """
+        self._file.write(encode_move(player_id, move))
+        self.turn += 1
+        if self.turn % self.checkpoint_every == 0 or \
+                (move is not None and move[1] in (UNDO, REDO)):
+            self._checkpoint()
+
+    def close(self) -> None:
+        """Write everything recorded to the journal file and close it."""
+        self._file.close()
+
+    def _checkpoint(self) -> None:
+        """Record the board as it is after self.turn moves."""
+        data = encode_board(self.board)
+        self._file.write(struct.pack('<BIH', CHECKPOINT, self.turn,
+                                     len(data)) + data)
+
+
+class Replay:
+    """The moves of a game read back from its journal.
+
+    === Public Attributes ===
+    moves:
+        moves[i] is the (player id, move) pair of the move of turn i, where
+        move is in the format of Player.last_move
+    """
+    # === Private Attributes ===
+    # _checkpoints:
+    #     (turn, encoded board) pairs of the checkpoints, in order of turn
+    moves: List[Tuple[int, Optional[Tuple[Tuple[int, ...], int,
+                                          Optional[int]]]]]
+    _checkpoints: List[Tuple[int, bytes]]
+
+    def __init__(self, path: str) -> None:
+        """Read the journal at <path>.
+
+        Raise ValueError if <path> is not a journal.
+        """
+        with open(path, 'rb') as journal:
+            data = journal.read()
+        if data[:len(JOURNAL_MAGIC)] != JOURNAL_MAGIC or \
+                data[len(JOURNAL_MAGIC)] != JOURNAL_VERSION:
+            raise ValueError(f'{path} is not a Blocky journal')
+
+        self.moves = []
+        self._checkpoints = []
+        position = len(JOURNAL_MAGIC) + 1
+        while position < len(data):
+            if data[position] == CHECKPOINT:
+                _, turn, length = struct.unpack_from('<BIH', data, position)
+                position += 7
+                self._checkpoints.append(
+                    (turn, data[position:position + length]))
+                position += length
+            else:
+                player_id, decider, length = data[position + 1:position + 4]
+                position += 4
+                if decider == PASS:
+                    self.moves.append((player_id, None))
+                    continue
+                packed = data[position:position + (length + 3) // 4]
+                position += len(packed)
+                path = tuple((packed[i // 4] >> (2 * (i % 4))) & 3
+                             for i in range(length))
+                seed = None
+                if decider == 4:
+                    seed = struct.unpack_from('<I', data, position)[0]
+                    position += 4
+                self.moves.append((player_id, (path, decider, seed)))
+
+    def __len__(self) -> int:
+        """Return the number of moves in this replay."""
+        return len(self.moves)
+
+    def board_at(self, turn: int) -> Block:
+        """Return the board as it was after the first <turn> moves, rebuilt
+        from the last checkpoint at or before <turn>.
+
+        Position and size are not set; they can be set by the client using
+        method update_block_locations.
+
+        Precondition: 0 <= turn <= len(self)
+        """
+        start, data = self._checkpoints[0]
+        for checkpoint_turn, checkpoint_data in self._checkpoints:
+            if checkpoint_turn > turn:
+                break
+            start, data = checkpoint_turn, checkpoint_data
+
+        board = decode_board(data)
+        for _, move in self.moves[start:turn]:
+            apply_move(board, move)
+        return board
+
+
+def apply_move(board: Block,
+               move: Optional[Tuple[Tuple[int, ...], int, Optional[int]]]) \
+        -> None:
+    """Make <move>, in the format of Player.last_move, on <board>.
+
+    Precondition: <move> does not undo or redo another move.
+    """
+    if move is not None:
+        path, decider, seed = move
+        random_move(decider, board.get_block(path), seed)
+
+
+if __name__ == '__main__':
+    import python_ta
+
+    python_ta.check_all(config={
+        'allowed-import-modules': [
+            'doctest', 'python_ta', 'typing', 'struct',
+            'block', 'player'
+        ]
+    })
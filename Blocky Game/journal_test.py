@@ -0,0 +1,82 @@
+"""Assignment 2 - Blocky: Journal tests
+
+=== Module Description ===
+
+This file contains tests for journal.py.
+"""
+import random
+from block import random_init, encode_board, decode_board
+from game import Game
+from journal import Replay, JournalWriter
+from player import UNDO
+from simple_test import equal_boards
+
+
+def test_encode_decode_board() -> None:
+    """Decoding an encoded board gives the same board."""
+    random.seed(148)
+    board = random_init(0, 5)
+    decoded = decode_board(encode_board(board))
+    assert equal_boards(board, decoded)
+    assert decoded.max_depth == 5
+
+
+def test_replay_rebuilds_every_turn(tmp_path) -> None:
+    """Replaying a journal, smashes included, rebuilds the board of every
+    turn of a game."""
+    path = str(tmp_path / 'game.journal')
+    random.seed(1001)
+    game = Game(3, 0, 2, [1], headless=True)
+    game.journal = JournalWriter(path, game.board, checkpoint_every=4)
+
+    boards = [game.board.copy()]
+    for player in game.players * 4:
+        player.make_move(game.board)
+        game.journal.record(player.id, player.last_move)
+        boards.append(game.board.copy())
+    game.journal.close()
+
+    replay = Replay(path)
+    assert len(replay) == 12
+    assert any(move is not None and move[1] == 4
+               for _, move in replay.moves)
+    for turn in [12, 0, 5, 8, 3]:
+        assert equal_boards(replay.board_at(turn), boards[turn])
+
+
+def test_game_writes_journal(tmp_path) -> None:
+    """A game given a journal path records all of its moves."""
+    path = str(tmp_path / 'game.journal')
+    random.seed(7)
+    game = Game(4, 0, 1, [2], headless=True, journal_path=path)
+    game.run_game(5, verbose=False)
+    replay = Replay(path)
+    assert len(replay) == 10
+    assert [player_id for player_id, _ in replay.moves] == [0, 1] * 5
+    assert equal_boards(replay.board_at(10), game.board)
+
+
+def test_replay_with_undo(tmp_path) -> None:
+    """Turns after an undone smash are rebuilt from their checkpoint."""
+    path = str(tmp_path / 'game.journal')
+    random.seed(148)
+    game = Game(3, 0, 1, [], headless=True)
+    game.journal = JournalWriter(path, game.board, checkpoint_every=100)
+    player = game.players[0]
+
+    boards = [game.board.copy()]
+    player.record_move(game.board.children[0], 4)
+    game.journal.record(player.id, player.last_move)
+    boards.append(game.board.copy())
+    game.board.history.undo()
+    game.journal.record(player.id, ((), UNDO, None))
+    boards.append(game.board.copy())
+    player.record_move(game.board.children[1], 0)
+    game.journal.record(player.id, player.last_move)
+    boards.append(game.board.copy())
+    game.journal.close()
+
+    replay = Replay(path)
+    for turn in range(4):
+        assert equal_boards(replay.board_at(turn), boards[turn])
+    assert equal_boards(replay.board_at(2), boards[0])
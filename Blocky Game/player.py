@@ -12,14 +12,28 @@ This file contains the player class hierarchy.
 """
 
 import random
-from typing import Optional
+import math
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, List, Tuple, Dict
 import pygame
 from renderer import Renderer, BOARD_WIDTH
-from block import Block
+from block import Block, BlockIndex
 from goal import Goal
 
 TIME_DELAY = 600
 
+# The deciders of last_move for taking back a move and for making a taken
+# back move again; see MoveHistory.
+UNDO = 5
+REDO = 6
+
+# The ways a computer player can choose a random block; see choose_block.
+PIXEL_SAMPLING = 'pixel'
+NODE_SAMPLING = 'node'
+LEVEL_SAMPLING = 'level'
+
 
 class Player:
     """A player in the Blocky game.
@@ -35,10 +49,19 @@ class Player:
         for example as "Player 2"
     goal:
         This player's assigned goal for the game.
+    last_move:
+        The last move this player made, as a (path, decider, seed) triple:
+        path leads from the top-level block to the block that was moved (see
+        Block.get_block), decider is the action as described in random_move,
+        and seed is the seed the block was smashed with, or None if the move
+        was not a smash.  Undoing or redoing a move is recorded as
+        ((), UNDO, None) or ((), REDO, None).  None if the last move changed
+        nothing or this player has not moved yet.
     """
     renderer: Renderer
     id: int
     goal: Goal
+    last_move: Optional[Tuple[Tuple[int, ...], int, Optional[int]]]
 
     def __init__(self, renderer: Renderer, player_id: int, goal: Goal) -> None:
         """Initialize this Player.
@@ -46,6 +69,7 @@ class Player:
         self.goal = goal
         self.renderer = renderer
         self.id = player_id
+        self.last_move = None
 
     def make_move(self, board: Block) -> int:
         """Choose a move to make on the given board, and apply it, mutating
@@ -55,12 +79,55 @@ class Player:
         """
         raise NotImplementedError
 
+    def _apply_move(self, board: Block, block: Block, decider: int) -> None:
+        """Show the chosen <block> highlighted on <board>, wait so the user can
+        see what is happening, then apply the move <decider> to <block> (as
+        described in random_move) and draw the result.
+        """
+        block.highlighted = True
+        # select the block
+
+        self.renderer.draw(board, self.id)
+        # to draw the frame around the selected block with HIGHLIGHT_COLOUR
+
+        self.renderer.wait(TIME_DELAY)
+        # to introduce a delay so that the user can see what is happening.
+
+        self.record_move(block, decider)
+        # move the selected block with the chosen action
+
+        block.highlighted = False
+        # unselect the block
+
+        self.renderer.draw(board, self.id)
+        # to draw the change that happens because of our random_move
+
+    def record_move(self, block: Block, decider: int) -> None:
+        """Apply the move <decider> to <block> (as described in random_move)
+        and remember it in last_move, and in the MoveHistory of the board if
+        it has one.
+
+        A smash is done with a fresh seed drawn from the random module, so
+        that it can be repeated exactly later.
+        """
+        seed = random.getrandbits(32) if decider == 4 else None
+        self.last_move = (block.get_path(), decider, seed)
+        history = block.get_root().history
+        if history is not None:
+            history.apply(block, decider, seed)
+        else:
+            random_move(decider, block, seed)
+
 
 class HumanPlayer(Player):
     """A human player.
 
     A HumanPlayer can do a limited number of smashes.
 
+    If the board has a MoveHistory, a HumanPlayer can also use its turn to
+    undo the last move made on the board (by any player) or to redo the
+    last undone move.
+
     === Public Attributes ===
     num_smashes:
         number of smashes which this HumanPlayer has performed
@@ -132,7 +199,12 @@ class HumanPlayer(Player):
         self._level = block.level
 
         if event.type == pygame.MOUSEBUTTONDOWN:
-            block.rotate(event.button)
+            if event.button == 1 or event.button == 3:
+                # left button rotates clockwise, right button counterclockwise
+                self.record_move(block, 0 if event.button == 1 else 1)
+            else:
+                # other buttons use up the turn without changing anything
+                self.last_move = None
             return 1
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_UP:
@@ -146,24 +218,37 @@ class HumanPlayer(Player):
                 return None
 
             elif event.key == pygame.K_h:
-                block.swap(0)
+                self.record_move(block, 2)
                 return 1
 
             elif event.key == pygame.K_v:
-                block.swap(1)
+                self.record_move(block, 3)
                 return 1
 
             elif event.key == pygame.K_s:
                 if self.num_smashes >= self.MAX_SMASHES:
                     print('Can\'t smash again!')
                     return 0
-                if block.smash():
+                if block.level != 0 and block.level != block.max_depth:
+                    self.record_move(block, 4)
                     self.num_smashes += 1
                     return 1
                 else:
                     print('Tried to smash at an invalid depth!')
                     return 0
 
+            elif event.key == pygame.K_u or event.key == pygame.K_r:
+                history = board.history
+                undo = event.key == pygame.K_u
+                if history is None:
+                    print('Moves can\'t be taken back in this game!')
+                    return 0
+                if (history.undo() if undo else history.redo()):
+                    self.last_move = ((), UNDO if undo else REDO, None)
+                    return 1
+                print(f'Nothing to {"undo" if undo else "redo"}!')
+                return 0
+
     def make_move(self, board: Block) -> int:
         """Choose a move to make on the given board, and apply it, mutating
         the Board as appropriate.
@@ -172,6 +257,21 @@ class HumanPlayer(Player):
 
         This method will hold focus until a valid move is performed.
         """
+        self.start_turn(board)
+
+        # Keep checking the moves performed by the player until a valid move
+        # has been completed. Draw the board on every loop to draw the
+        # selected block properly on screen.
+        while True:
+            self.renderer.draw(board, self.id)
+            result = self.poll(board)
+            if result is not None:
+                return result
+
+    def start_turn(self, board: Block) -> None:
+        """Get ready for a turn on <board>: select the whole board and forget
+        any user input given before the turn.
+        """
         self._level = 0
         self._selected_block = board
 
@@ -179,24 +279,29 @@ class HumanPlayer(Player):
         # have added events to the queue accidentally.
         pygame.event.clear()
 
-        # Keep checking the moves performed by the player until a valid move
-        # has been completed. Draw the board on every loop to draw the
-        # selected block properly on screen.
-        while True:
-            self.renderer.draw(board, self.id)
-            # loop through all of the events within the event queue
-            # (all pending events from the user input)
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return 1
+    def poll(self, board: Block) -> Optional[int]:
+        """Process all the pending events of the user on <board>, without
+        waiting for new ones.
+
+        Return None if no move has been completed yet, 0 if a valid move was
+        performed, and 1 upon a QUIT event.
 
-                result = self.process_event(board, event)
+        Precondition: start_turn has been called for this turn.
+        """
+        # loop through all of the events within the event queue
+        # (all pending events from the user input)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return 1
+
+            result = self.process_event(board, event)
+            self.renderer.draw(board, self.id)
+            if result is not None and result > 0:
+                # un-highlight the selected block
+                self._selected_block.highlighted = False
                 self.renderer.draw(board, self.id)
-                if result is not None and result > 0:
-                    # un-highlight the selected block
-                    self._selected_block.highlighted = False
-                    self.renderer.draw(board, self.id)
-                    return 0
+                return 0
+        return None
 
 
 class RandomPlayer(Player):
@@ -207,13 +312,21 @@ class RandomPlayer(Player):
 
     It has a unlimited number of smash moves, but it its smash move is invalid
     it will use its turn
+
+    === Public Attributes ===
+    sampling:
+        how this RandomPlayer chooses its block, as described in
+        choose_block
     """
+    sampling: str
 
-    def __init__(self, renderer: Renderer, player_id: int, goal: Goal) -> None:
+    def __init__(self, renderer: Renderer, player_id: int, goal: Goal,
+                 sampling: str = PIXEL_SAMPLING) -> None:
         """Initialize this RandomPlayer with the given <renderer>, <player_id>
                 and <goal>. by calling its superclass __init__"""
 
         super().__init__(renderer, player_id, goal)
+        self.sampling = sampling
 
     def make_move(self, board: Block) -> int:
 
@@ -226,36 +339,20 @@ class RandomPlayer(Player):
          can't Quit therefore it won't return 1 in any case.
 
          """
-        x = random.randint(0, BOARD_WIDTH)
-        y = random.randint(0, BOARD_WIDTH)
-        # producing random location (x, y) which is inside the area of the board
-
-        random_level = random.randint(0, board.max_depth)
-        # producing random level ( <= board.max_depth )
-        block = board.get_selected_block((x, y), random_level)
-        # choose a block on the board base on the identities that we randomly
-        # generate
-
-        block.highlighted = True
-        # select the generated block
-
-        self.renderer.draw(board, self.id)
-        # to draw the frame around the selected block with HIGHLIGHT_COLOUR
+        path, decider = self.choose_move(board)
+        self._apply_move(board, board.get_block(path), decider)
+        return 0
 
-        pygame.time.wait(TIME_DELAY)
-        # to introduce a delay so that the user can see what is happening.
+    def choose_move(self, board: Block) -> Tuple[Tuple[int, ...], int]:
+        """Return a random move on <board> as a (path, decider) pair (see
+        SearchPlayer.choose_move).  <board> is left unchanged.
+        """
+        block = choose_block(board, self.sampling)
+        # choose a random block on the board
 
-        random_move(random.randint(0, 4), block)
         # random.randint will produce a number from {0, 1, 2, 3, 4} which
         # tell the functiom (random_move) what to do to the block
-
-        block.highlighted = False
-        # unselect the block
-
-        self.renderer.draw(board, self.id)
-        # to draw the change that happens because of our random_move
-
-        return 0
+        return block.get_path(), random.randint(0, 4)
 
 
 class SmartPlayer(Player):
@@ -264,24 +361,66 @@ class SmartPlayer(Player):
     which choose number of random moves base on its given difficulty and will do
     the one which will gain the most score among them for the player.
 
+    If it is given a time_limit, it instead checks as many moves as fit in
+    that many milliseconds, the most promising ones first, so that its turns
+    take about the same time on any board.
+
     === Public Attributes ===
     moves_to_check:
         number of moves which this SmartPlayer will check and do the most
         valuable one ( the one which will gain biggest score among the others )
+    time_limit:
+        number of milliseconds this SmartPlayer may spend checking moves, or
+        None to check moves_to_check moves
+    last_evaluated:
+        number of moves which this SmartPlayer checked during its last turn
+    sampling:
+        how this SmartPlayer chooses the blocks of the moves it checks, as
+        described in choose_block
+    top_k:
+        if not None, the moves are first ranked by Goal.approximate_score
+        at level <resolution>, and only the best top_k of them are scored
+        exactly
+    resolution:
+        the level at which the approximate scores are computed
+    audit:
+        True iff the moves ranked by approximate scores are also all scored
+        exactly, to count how often the approximation changes the move made
+    approximate_turns:
+        the number of turns this SmartPlayer ranked its moves approximately
+        with audit on
+    approximate_changed:
+        the number of those turns in which a move with a better exact score
+        than the one made was left out by the approximate ranking
     === Representation Invariants ===
     0 <= moves_to_check <= 150
+    top_k is None or top_k >= 1
+    0 <= approximate_changed <= approximate_turns
 
     SmartPlayer can't do the smash move.
 
     """
     moves_to_check: int
+    time_limit: Optional[float]
+    last_evaluated: int
+    sampling: str
+    top_k: Optional[int]
+    resolution: int
+    audit: bool
+    approximate_turns: int
+    approximate_changed: int
 
     def __init__(self, renderer: Renderer, player_id: int, goal: Goal,
-                 difficulty: int) -> None:
+                 difficulty: int, time_limit: Optional[float] = None,
+                 sampling: str = PIXEL_SAMPLING, top_k: Optional[int] = None,
+                 resolution: int = 2, audit: bool = False) -> None:
         """
         Initialize this SmartPlayer with the given < renderer >,
         < player_id > and < goal >. by calling it's superclass initializer.
 
+        If <time_limit> is not None, the SmartPlayer checks moves for that
+        many milliseconds per turn and <difficulty> is not used.
+
         And also set the move_to_check attribute of it base on the given
         <difficulty> . Base on this shcheme:
 
@@ -309,6 +448,15 @@ class SmartPlayer(Player):
             # difficulty >= 5
             self.moves_to_check = 150
 
+        self.time_limit = time_limit
+        self.last_evaluated = 0
+        self.sampling = sampling
+        self.top_k = top_k
+        self.resolution = resolution
+        self.audit = audit
+        self.approximate_turns = 0
+        self.approximate_changed = 0
+
     def make_move(self, board: Block):
         """Produce random moves (moves_to_check) times and make those moves
          on the <board> to calculate their score and then undo them. Then store
@@ -317,14 +465,48 @@ class SmartPlayer(Player):
          among the other moves that we have generated.
 
          Each random move will be produced by calling the _move method on the
-         random block that will be generated by producing random location and
-         random level( <= board.max_depth ) on the given <board>.
+         random block that will be chosen by choose_block on the given <board>.
 
          Return 0 upon successful completion of a move. And since random player
          can't Quit therefore it won't return 1 in any case.
 
+         If this SmartPlayer has a time_limit, the moves are checked as
+         described in _timed_move instead, and if it has a top_k they are
+         checked as described in _approximate_move.
          """
+        move = self._choose_block_move(board)
+        if move is not None:
+            self._apply_move(board, move[0], move[1])
+        else:
+            self.last_move = None
+        return 0
 
+    def choose_move(self, board: Block) -> Optional[Tuple[Tuple[int, ...],
+                                                          int]]:
+        """Return the move make_move would make on <board> as a (path,
+        decider) pair (see SearchPlayer.choose_move), or None if there is no
+        block on <board> that can be moved.  <board> is left unchanged.
+        """
+        move = self._choose_block_move(board)
+        if move is None:
+            return None
+        return move[0].get_path(), move[1]
+
+    def _choose_block_move(self, board: Block) -> Optional[Tuple[Block, int]]:
+        """Return the move make_move would make on <board> as a (block,
+        decider) pair, or None if there is no block on <board> that can be
+        moved.
+        """
+        if self.time_limit is not None:
+            return self._timed_move(board)
+        if self.top_k is not None:
+            return self._approximate_move(board)
+        return self._sampled_move(board)
+
+    def _sampled_move(self, board: Block) -> Tuple[Block, int]:
+        """Check moves_to_check random moves on <board> and return the one
+        with the best score as a (block, decider) pair.
+        """
         max_score = 0
         # minimum score is 0.
 
@@ -338,17 +520,8 @@ class SmartPlayer(Player):
 
         for _ in range(self.moves_to_check):
 
-            x = random.randint(0, BOARD_WIDTH)
-            y = random.randint(0, BOARD_WIDTH)
-            # producing random location (x, y)
-            # which is inside the area of the board
-
-            random_level = random.randint(0, board.max_depth)
-            # producing random level ( <= board.max_depth )
-
-            block = board.get_selected_block((x, y), random_level)
-            # choose a block on the board base on the identities that we
-            # randomly generated
+            block = choose_block(board, self.sampling)
+            # choose a random block on the board
 
             decider = random.randint(0, 3)
             # it is the number between 0 and 3 which base on it's value, our
@@ -369,32 +542,686 @@ class SmartPlayer(Player):
             undo_move(block, decider)
             # undo the move that we have (done and calculated its score)
 
-        block = best_block
-        # chooose the stored block as the best_block to lead us to the highest
-        # possible score among the other moves that we haved check
+        self.last_evaluated = self.moves_to_check
+        # the stored best_block with the best action gains the most score
+        return best_block, best_move
 
-        block.highlighted = True
-        # select the block
+    def _approximate_move(self, board: Block) -> Tuple[Block, int]:
+        """Produce moves_to_check random moves on <board> like make_move, but
+        rank them by their approximate score first and return the one with
+        the best exact score among the top_k best ranked, as a (block,
+        decider) pair.
 
-        self.renderer.draw(board, self.id)
-        # to draw the frame around the selected block with HIGHLIGHT_COLOUR
+        With audit on, also find the best exact score of all the moves and
+        update approximate_turns and approximate_changed.
+        """
+        candidates = []
+        for _ in range(self.moves_to_check):
+            block = choose_block(board, self.sampling)
+            decider = random.randint(0, 3)
+            random_move(decider, block)
+            approximate = self.goal.approximate_score(board, self.resolution)
+            exact = self.goal.score(board) if self.audit else None
+            undo_move(block, decider)
+            candidates.append((approximate, exact, block, decider))
+
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        best = None
+        max_score = -1
+        for _, exact, block, decider in candidates[:self.top_k]:
+            if exact is None:
+                random_move(decider, block)
+                exact = self.goal.score(board)
+                undo_move(block, decider)
+            if exact > max_score:
+                max_score = exact
+                best = (block, decider)
+        self.last_evaluated = min(self.top_k, len(candidates))
+
+        if self.audit:
+            self.approximate_turns += 1
+            if max(candidate[1] for candidate in candidates) > max_score:
+                self.approximate_changed += 1
+        return best
+
+    def _timed_move(self, board: Block) -> Optional[Tuple[Block, int]]:
+        """Check moves on <board> until time_limit milliseconds have passed
+        and return the best one as a (block, decider) pair, or None if no
+        block on <board> can be moved.
+
+        Only rotations and swaps of blocks that contain some of the goal
+        colour are checked, since the others can't change the score, and
+        blocks with more of the goal colour are checked first.  At least one
+        move is checked however small the time limit is.
+        """
+        deadline = time.perf_counter() + self.time_limit / 1000
+        best = None
+        max_score = -1
+        self.last_evaluated = 0
+
+        for block in _blocks_by_colour(board, self.goal.colour):
+            for decider in random.sample(range(4), 4):
+                if best is not None and time.perf_counter() > deadline:
+                    return best
+                random_move(decider, block)
+                score = self.goal.score(board)
+                undo_move(block, decider)
+                self.last_evaluated += 1
+                if score > max_score:
+                    max_score = score
+                    best = (block, decider)
+        return best
+
+
+class SearchPlayer(Player):
+    """ A Search player
+
+    which looks several plies ahead with alpha-beta search before choosing its
+    move. After its own move every opponent is assumed to answer with the move
+    that hurts this player's score the most, so the value of a move is the
+    score it can guarantee at the end of the lookahead.
+
+    Positions that have already been searched are remembered in a bounded
+    transposition table keyed on Block.board_hash, and moves are tried in the
+    order of their immediate score so that the best moves are searched first
+    and most of the others can be cut off.
+
+    The search deepens one ply at a time until <time_limit> runs out and the
+    move found by the deepest finished search is played.
 
-        pygame.time.wait(TIME_DELAY)
-        # to introduce a delay so that the user can see what is happening.
+    === Public Attributes ===
+    depth:
+        the maximum number of plies (moves by this player or its opponents)
+        this SearchPlayer looks ahead
+    breadth:
+        the maximum number of candidate moves considered in every position
+    num_opponents:
+        the number of opponent moves between two moves of this player
+    time_limit:
+        the number of milliseconds this SearchPlayer may think per turn, or
+        None to use the time a difficulty 5 SmartPlayer needs to check its
+        150 moves on the current board
+    table_size:
+        the maximum number of positions kept in the transposition table
+    last_depth:
+        the depth of the deepest search that finished during the last turn
+    === Representation Invariants ===
+    depth >= 1
+    breadth >= 1
+    num_opponents >= 0
+    table_size >= 0
 
-        random_move(best_move, block)
-        # move the selected block with the best action to gain more score
+    SearchPlayer can't do the smash move.
+    """
+    # === Private Attributes ===
+    # _table:
+    #     The transposition table. Maps (board hash, remaining depth, ply)
+    #     to (value, bound, best move) where bound is one of _EXACT, _LOWER
+    #     and _UPPER, and best move is a (path, decider) pair or None.
+    # _deadline:
+    #     The time.perf_counter() value at which the current search must stop.
+
+    depth: int
+    breadth: int
+    num_opponents: int
+    time_limit: Optional[float]
+    table_size: int
+    last_depth: int
+    _table: 'OrderedDict'
+    _deadline: float
 
-        block.highlighted = False
-        # unselect the block
+    def __init__(self, renderer: Renderer, player_id: int, goal: Goal,
+                 depth: int = 3, breadth: int = 12, num_opponents: int = 1,
+                 time_limit: Optional[float] = None,
+                 table_size: int = 100000) -> None:
+        """Initialize this SearchPlayer with the given <renderer>,
+        <player_id> and <goal> by calling its superclass initializer, and
+        with the given search settings.
+        """
+        super().__init__(renderer, player_id, goal)
+        self.depth = depth
+        self.breadth = breadth
+        self.num_opponents = num_opponents
+        self.time_limit = time_limit
+        self.table_size = table_size
+        self.last_depth = 0
+        self._table = OrderedDict()
+        self._deadline = 0.0
 
-        self.renderer.draw(board, self.id)
-        # to draw the change that happens because of our random_move
+    def make_move(self, board: Block) -> int:
+        """Search for the best move on the given <board> and make it.
 
+        Return 0 upon successful completion of a move. And since search player
+        can't Quit therefore it won't return 1 in any case.
+        """
+        move = self.choose_move(board)
+        if move is not None:
+            path, decider = move
+            self._apply_move(board, board.get_block(path), decider)
+        else:
+            # a board that is a single unit cell has nothing to move
+            self.last_move = None
         return 0
 
+    def choose_move(self, board: Block) -> Optional[Tuple[Tuple[int, ...],
+                                                          int]]:
+        """Return the best move found on <board> as a (path, decider) pair,
+        where path leads from <board> to the block to move (see
+        Block.get_block) and decider is the action as described in
+        random_move.
+
+        Return None if there is no block on <board> that can be moved.
+        <board> is left unchanged.
+        """
+        time_limit = self.time_limit
+        if time_limit is None:
+            time_limit = _smart_player_time(self.goal, board)
+        self._deadline = time.perf_counter() + time_limit / 1000
+
+        moves = _search_moves(board, self.breadth)
+        if len(moves) == 0:
+            return None
+
+        best = moves[0]
+        self.last_depth = 0
+        for depth in range(1, self.depth + 1):
+            # iterative deepening: every finished search orders the moves for
+            # the next, deeper one
+            try:
+                values = self._search_root(board, moves, depth)
+            except _SearchTimeout:
+                break
+            moves.sort(key=lambda move: values[move], reverse=True)
+            best = moves[0]
+            self.last_depth = depth
+        return best
+
+    def _search_root(self, board: Block,
+                     moves: List[Tuple[Tuple[int, ...], int]],
+                     depth: int) -> Dict[Tuple[Tuple[int, ...], int], int]:
+        """Return the value of each of the <moves> on <board> when searched
+        <depth> plies deep.
+        """
+        values = {}
+        alpha = -1
+        for path, decider in moves:
+            block = board.get_block(path)
+            random_move(decider, block)
+            value = self._alpha_beta(board, depth - 1, 1, alpha, math.inf)
+            undo_move(block, decider)
+            values[(path, decider)] = value
+            alpha = max(alpha, value)
+        return values
+
+    def _alpha_beta(self, board: Block, depth: int, ply: int,
+                    alpha: float, beta: float) -> int:
+        """Return the value of <board> searched <depth> more plies deep, where
+        <ply> counts the moves made since the root and decides whose turn it
+        is. Values outside (<alpha>, <beta>) are only bounds of the real value.
+
+        Raise _SearchTimeout when the deadline of this search has passed.
+        """
+        if depth == 0:
+            return self.goal.score(board)
+        if time.perf_counter() > self._deadline:
+            raise _SearchTimeout
+
+        turn = ply % (self.num_opponents + 1)
+        key = (board.board_hash(), depth, turn)
+        table_move = None
+        entry = self._table.get(key)
+        if entry is not None:
+            value, bound, table_move = entry
+            self._table.move_to_end(key)
+            if bound == _EXACT:
+                return value
+            elif bound == _LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        maximizing = turn == 0
+        original_alpha, original_beta = alpha, beta
+        best_value = -1 if maximizing else math.inf
+        best_move = None
+        for path, decider in self._ordered_moves(board, maximizing,
+                                                 table_move, depth > 1):
+            block = board.get_block(path)
+            random_move(decider, block)
+            value = self._alpha_beta(board, depth - 1, ply + 1, alpha, beta)
+            undo_move(block, decider)
+
+            if (maximizing and value > best_value) or \
+                    (not maximizing and value < best_value):
+                best_value = value
+                best_move = (path, decider)
+            if maximizing:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                # the other side will never allow this position
+                break
+
+        if best_move is None:
+            # nothing can be moved, so the position keeps its current score
+            best_value = self.goal.score(board)
+
+        if best_value <= original_alpha:
+            bound = _UPPER
+        elif best_value >= original_beta:
+            bound = _LOWER
+        else:
+            bound = _EXACT
+        self._store(key, (best_value, bound, best_move))
+        return best_value
+
+    def _ordered_moves(self, board: Block, maximizing: bool,
+                       table_move: Optional[Tuple[Tuple[int, ...], int]],
+                       by_score: bool) -> List[Tuple[Tuple[int, ...], int]]:
+        """Return candidate moves on <board> as (path, decider) pairs, ordered
+        so that the most promising move for the side to play comes first.
+
+        <table_move>, the best move remembered in the transposition table, is
+        always considered and put in front of the others.  If <by_score> is
+        True the other moves are ordered by this player's score right after
+        the move; otherwise they are left in random order, which is cheaper
+        when each move will be scored only once anyway.
+        """
+        moves = _search_moves(board, self.breadth)
+        if table_move is not None and table_move in moves:
+            moves.remove(table_move)
+
+        if by_score:
+            scores = {}
+            for path, decider in moves:
+                block = board.get_block(path)
+                random_move(decider, block)
+                scores[(path, decider)] = self.goal.score(board)
+                undo_move(block, decider)
+            moves.sort(key=lambda move: scores[move], reverse=maximizing)
+
+        if table_move is not None:
+            moves.insert(0, table_move)
+        return moves
+
+    def _store(self, key: Tuple[int, int, int],
+               entry: Tuple[int, int, Optional[Tuple[Tuple[int, ...], int]]]) \
+            -> None:
+        """Store <entry> for <key> in the transposition table, discarding the
+        least recently used position if the table is full.
+        """
+        if self.table_size == 0:
+            return
+        self._table[key] = entry
+        self._table.move_to_end(key)
+        if len(self._table) > self.table_size:
+            self._table.popitem(last=False)
+
+
+class MCTSPlayer(Player):
+    """ A Monte Carlo Tree Search player
+
+    which plays many random continuations of the game (rollouts) on copies of
+    the board until its time runs out, and then makes the move that was tried
+    most often.  The moves tried in the first plies of a rollout are chosen
+    with the UCB1 rule, so the search concentrates on the moves that have led
+    to the best scores so far; the rest of a rollout, like every opponent
+    move, is chosen the way a RandomPlayer chooses its moves.
+
+    With <workers> greater than 1, that many processes search independently
+    from the same candidate moves and their visit counts are added together
+    (root parallelisation), so the player gets stronger with more cores as
+    well as with more time.
 
-def random_move(decider: int, block: Block) -> None:
+    === Public Attributes ===
+    time_limit:
+        the number of milliseconds this MCTSPlayer may think per turn
+    breadth:
+        the maximum number of candidate moves tried in every tree node
+    rollout_depth:
+        the number of turns played randomly after leaving the tree
+    num_opponents:
+        the number of opponent moves between two moves of this player
+    exploration:
+        the exploration constant of the UCB1 rule
+    workers:
+        the number of processes that search in parallel
+    last_rollouts:
+        the number of rollouts played during the last turn
+    === Representation Invariants ===
+    breadth >= 1
+    rollout_depth >= 0
+    num_opponents >= 0
+    workers >= 1
+
+    MCTSPlayer can't do the smash move itself, but the random rollouts
+    (as the RandomPlayers they imitate) may smash.
+    """
+    # === Private Attributes ===
+    # _pool:
+    #     The process pool used when workers > 1, created on the first move
+    #     that needs it and kept for the rest of the game.
+
+    time_limit: float
+    breadth: int
+    rollout_depth: int
+    num_opponents: int
+    exploration: float
+    workers: int
+    last_rollouts: int
+    _pool: Optional[ProcessPoolExecutor]
+
+    def __init__(self, renderer: Renderer, player_id: int, goal: Goal,
+                 time_limit: float = 1000, breadth: int = 20,
+                 rollout_depth: int = 2, num_opponents: int = 1,
+                 exploration: float = 1.4, workers: int = 1) -> None:
+        """Initialize this MCTSPlayer with the given <renderer>, <player_id>
+        and <goal> by calling its superclass initializer, and with the given
+        search settings.
+        """
+        super().__init__(renderer, player_id, goal)
+        self.time_limit = time_limit
+        self.breadth = breadth
+        self.rollout_depth = rollout_depth
+        self.num_opponents = num_opponents
+        self.exploration = exploration
+        self.workers = workers
+        self.last_rollouts = 0
+        self._pool = None
+
+    def make_move(self, board: Block) -> int:
+        """Search for the best move on the given <board> and make it.
+
+        Return 0 upon successful completion of a move. And since MCTS player
+        can't Quit therefore it won't return 1 in any case.
+        """
+        move = self.choose_move(board)
+        if move is not None:
+            path, decider = move
+            self._apply_move(board, board.get_block(path), decider)
+        else:
+            self.last_move = None
+        return 0
+
+    def choose_move(self, board: Block) -> Optional[Tuple[Tuple[int, ...],
+                                                          int]]:
+        """Return the most visited move after searching <board> for
+        time_limit milliseconds, as a (path, decider) pair (see
+        SearchPlayer.choose_move).
+
+        Return None if there is no block on <board> that can be moved.
+        <board> is left unchanged.
+        """
+        moves = _search_moves(board, self.breadth)
+        if len(moves) == 0:
+            return None
+
+        settings = (self.goal, self.breadth, self.rollout_depth,
+                    self.num_opponents, self.exploration)
+        if self.workers == 1:
+            visits = _mcts_search(board, moves, self.time_limit, settings)
+        else:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.workers)
+            futures = [
+                self._pool.submit(_mcts_worker, board, moves, self.time_limit,
+                                  settings, random.getrandbits(32))
+                for _ in range(self.workers)
+            ]
+            visits = [0] * len(moves)
+            for future in futures:
+                for i, count in enumerate(future.result()):
+                    visits[i] += count
+
+        self.last_rollouts = sum(visits)
+        return moves[visits.index(max(visits))]
+
+
+class _MCTSNode:
+    """A node of the tree searched by MCTSPlayer.
+
+    The tree is open loop: a node stands for a sequence of this player's
+    moves, not for one board, since the opponents' moves in between are
+    random.  A move whose block no longer exists is skipped.
+
+    === Attributes ===
+    untried:
+        the candidate moves that have no child node yet
+    children:
+        maps each tried move to the node reached by it
+    visits:
+        the number of rollouts that went through this node
+    total:
+        the sum of the scores of those rollouts
+    """
+    untried: List[Tuple[Tuple[int, ...], int]]
+    children: Dict[Tuple[Tuple[int, ...], int], '_MCTSNode']
+    visits: int
+    total: float
+
+    def __init__(self, untried: List[Tuple[Tuple[int, ...], int]]) -> None:
+        """Initialize this node with the given untried moves."""
+        self.untried = untried
+        self.children = {}
+        self.visits = 0
+        self.total = 0.0
+
+    def select(self, exploration: float, low: float, high: float) \
+            -> Tuple[Tuple[Tuple[int, ...], int], '_MCTSNode']:
+        """Return the (move, child) pair with the highest UCB1 value, with
+        average scores scaled from [<low>, <high>] to [0, 1].
+        """
+        spread = max(high - low, 1)
+        log_visits = math.log(self.visits)
+        best = None
+        best_value = -math.inf
+        for move, child in self.children.items():
+            mean = (child.total / child.visits - low) / spread
+            value = mean + exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best_value = value
+                best = (move, child)
+        return best
+
+
+class _SearchTimeout(Exception):
+    """Raised inside SearchPlayer's search when its time limit runs out."""
+
+
+# The kinds of value stored in SearchPlayer's transposition table.
+_EXACT = 0
+_LOWER = 1
+_UPPER = 2
+
+
+def _search_moves(board: Block, breadth: int) \
+        -> List[Tuple[Tuple[int, ...], int]]:
+    """Return at most <breadth> randomly chosen moves that can change <board>,
+    as (path, decider) pairs.
+
+    Only rotations and swaps (decider 0 to 3) of blocks that have children are
+    included, since the other moves leave the board as it is.
+    """
+    moves = []
+    stack = [((), board)]
+    while len(stack) != 0:
+        path, block = stack.pop()
+        if len(block.children) != 0:
+            for decider in range(4):
+                moves.append((path, decider))
+            for index in range(len(block.children)):
+                stack.append((path + (index,), block.children[index]))
+    if len(moves) > breadth:
+        moves = random.sample(moves, breadth)
+    return moves
+
+
+def _blocks_by_colour(board: Block, colour: Tuple[int, int, int]) \
+        -> List[Block]:
+    """Return the blocks of <board> that have children and contain some, but
+    not only, unit cells of <colour>, ordered from the most such cells to the
+    fewest (ties in random order).
+    """
+    found = []
+
+    def _count(block: Block) -> int:
+        """Return the number of unit cells of <colour> in <block>, recording
+        it in found for blocks with children.
+        """
+        if len(block.children) == 0:
+            if block.colour == colour:
+                return 4 ** (block.max_depth - block.level)
+            return 0
+        count = sum(_count(child) for child in block.children)
+        if 0 < count < 4 ** (block.max_depth - block.level):
+            # a block of only <colour> looks the same after any move
+            found.append((count, random.random(), block))
+        return count
+
+    _count(board)
+    found.sort(key=lambda item: item[:2], reverse=True)
+    return [item[2] for item in found]
+
+
+def _smart_player_time(goal: Goal, board: Block) -> float:
+    """Return an estimate, in milliseconds, of how long a difficulty 5
+    SmartPlayer with <goal> takes to check its 150 moves on <board>.
+    """
+    best = math.inf
+    for _ in range(3):
+        # scoring dominates the cost of checking a move, so time the fastest
+        # of a few scores to avoid counting in one-off delays
+        start = time.perf_counter()
+        goal.score(board)
+        best = min(best, time.perf_counter() - start)
+    return 150 * best * 1000
+
+
+def _mcts_search(board: Block, moves: List[Tuple[Tuple[int, ...], int]],
+                 time_limit: float, settings: tuple) -> List[int]:
+    """Search <board> for <time_limit> milliseconds starting from the
+    candidate <moves>, and return how many rollouts began with each of them.
+
+    <settings> holds the goal, breadth, rollout_depth, num_opponents and
+    exploration of the MCTSPlayer searching.
+    """
+    goal, breadth, rollout_depth, num_opponents, exploration = settings
+    deadline = time.perf_counter() + time_limit / 1000
+    root = _MCTSNode(list(moves))
+    low, high = math.inf, -math.inf
+
+    while time.perf_counter() < deadline or root.visits == 0:
+        state = board.copy()
+        node = root
+        visited = [root]
+
+        # selection: follow the best children while the node is fully tried
+        while len(node.untried) == 0 and len(node.children) != 0:
+            move, node = node.select(exploration, low, high)
+            _play_turn(state, move, num_opponents)
+            visited.append(node)
+
+        # expansion: try one new move from this node
+        if len(node.untried) != 0:
+            move = node.untried.pop(random.randrange(len(node.untried)))
+            _play_turn(state, move, num_opponents)
+            child = _MCTSNode(_search_moves(state, breadth))
+            node.children[move] = child
+            visited.append(child)
+
+        # rollout: finish with random moves and score the result
+        for _ in range(rollout_depth):
+            _play_turn(state, None, num_opponents)
+        score = goal.score(state)
+        low, high = min(low, score), max(high, score)
+
+        for node in visited:
+            node.visits += 1
+            node.total += score
+
+    return [root.children[move].visits if move in root.children else 0
+            for move in moves]
+
+
+def _mcts_worker(board: Block, moves: List[Tuple[Tuple[int, ...], int]],
+                 time_limit: float, settings: tuple, seed: int) -> List[int]:
+    """Run _mcts_search in a worker process with its own random <seed>."""
+    random.seed(seed)
+    return _mcts_search(board, moves, time_limit, settings)
+
+
+def _play_turn(board: Block, move: Optional[Tuple[Tuple[int, ...], int]],
+               num_opponents: int) -> None:
+    """Make <move> on <board>, or a random move if <move> is None, and then
+    a random move for each of the <num_opponents> opponents.
+
+    The random moves are chosen like RandomPlayer chooses its moves.  <move>
+    is skipped if its block is not on <board> anymore.
+    """
+    if move is None:
+        _random_player_move(board)
+    else:
+        block = board
+        for index in move[0]:
+            if len(block.children) == 0:
+                break
+            block = block.children[index]
+        else:
+            random_move(move[1], block)
+    for _ in range(num_opponents):
+        _random_player_move(board)
+
+
+def _random_player_move(board: Block) -> None:
+    """Make a random move on <board> the way RandomPlayer.make_move does,
+    without drawing anything.
+    """
+    x = random.randint(0, BOARD_WIDTH)
+    y = random.randint(0, BOARD_WIDTH)
+    level = random.randint(0, board.max_depth)
+    block = board.get_selected_block((x, y), level)
+    random_move(random.randint(0, 4), block)
+
+
+def choose_block(board: Block, sampling: str) -> Block:
+    """Return a random block of <board>, chosen according to <sampling>:
+
+    sampling == PIXEL_SAMPLING -> the block at a random location of the board
+                                  and a random level ( <= board.max_depth ).
+                                  Large blocks near the top of the tree are
+                                  chosen much more often than small ones.
+    sampling == NODE_SAMPLING -> every block of the board is equally likely
+    sampling == LEVEL_SAMPLING -> every level of the board that has blocks is
+                                  equally likely, and then every block of
+                                  that level
+
+    The last two use the BlockIndex of <board>, which is created the first
+    time it is needed.
+
+    Precondition: <board> is a top-level Block.
+    """
+    if sampling == PIXEL_SAMPLING:
+        x = random.randint(0, BOARD_WIDTH)
+        y = random.randint(0, BOARD_WIDTH)
+        # producing random location (x, y) which is inside the area of the board
+
+        random_level = random.randint(0, board.max_depth)
+        # producing random level ( <= board.max_depth )
+        return board.get_selected_block((x, y), random_level)
+
+    index = board.node_index
+    if index is None:
+        index = BlockIndex(board)
+    if sampling == NODE_SAMPLING:
+        return index.sample_block()
+    return index.sample_level()
+
+
+def random_move(decider: int, block: Block, seed: Optional[int] = None) \
+        -> None:
     """It generate the action on the given <block> base on the value of
     the <decider>
 
@@ -408,6 +1235,8 @@ def random_move(decider: int, block: Block) -> None:
 
     However since as a precondition we knoe that 0 <= decider <= 4
     so if decider is not 0 or 1 or 2 or 3, it will be 4.
+
+    A smash uses <seed> as described in Block.smash.
     """
     if decider == 0:
         block.rotate(1)
@@ -428,7 +1257,7 @@ def random_move(decider: int, block: Block) -> None:
     else:
         # therefor decider = 4
         # Smash
-        if block.smash():
+        if block.smash(seed):
             # print(f"Random player smash on level {block.level}")
             # it means that the smash move is valid
             return
@@ -494,7 +1323,7 @@ if __name__ == '__main__':
         'allowed-import-modules': [
             'doctest', 'python_ta', 'random', 'typing',
             'block', 'goal', 'player', 'renderer',
-            'pygame'
+            'pygame', 'math', 'time', 'collections', 'concurrent.futures'
         ],
         'max-attributes': 10,
         'generated-members': 'pygame.*'
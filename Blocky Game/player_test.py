@@ -0,0 +1,153 @@
+"""Assignment 2 - Blocky: Player tests
+
+=== Module Description ===
+
+This file contains tests for the computer players in player.py.
+"""
+import random
+from renderer import COLOUR_LIST
+from block import BlockIndex, random_init
+from goal import BlobGoal, PerimeterGoal
+from player import SmartPlayer, SearchPlayer, MCTSPlayer, random_move, \
+    undo_move, choose_block, NODE_SAMPLING, LEVEL_SAMPLING, _search_moves
+from simple_test import construct_board
+
+
+def test_search_player_leaves_board_unchanged() -> None:
+    """Searching for a move must not change the board."""
+    random.seed(148)
+    board = random_init(0, 3)
+    ref_board = board
+    player = SearchPlayer(None, 0, BlobGoal(COLOUR_LIST[0]), depth=3,
+                          time_limit=2000)
+    signature = board.board_hash()
+    move = player.choose_move(board)
+    assert move is not None
+    assert board is ref_board
+    assert board.board_hash() == signature
+
+
+def test_search_player_depth_one_is_greedy() -> None:
+    """A one ply search picks a move with the best immediate score."""
+    board, _ = construct_board()
+    goal = PerimeterGoal(COLOUR_LIST[3])
+    player = SearchPlayer(None, 0, goal, depth=1, breadth=1000,
+                          time_limit=10000)
+    path, decider = player.choose_move(board)
+
+    best = 0
+    for other_path, other_decider in _search_moves(board, 1000):
+        block = board.get_block(other_path)
+        random_move(other_decider, block)
+        best = max(best, goal.score(board))
+        undo_move(block, other_decider)
+
+    block = board.get_block(path)
+    random_move(decider, block)
+    assert goal.score(board) == best
+    assert player.last_depth == 1
+
+
+def test_search_player_table_is_bounded() -> None:
+    """The transposition table never holds more than table_size positions."""
+    random.seed(1001)
+    board = random_init(0, 3)
+    player = SearchPlayer(None, 0, BlobGoal(COLOUR_LIST[1]), depth=3,
+                          breadth=8, time_limit=2000, table_size=10)
+    player.choose_move(board)
+    assert 0 < len(player._table) <= 10
+
+
+
+def test_mcts_player_leaves_board_unchanged() -> None:
+    """MCTSPlayer plays rollouts on copies and returns a candidate move."""
+    random.seed(2017)
+    board = random_init(0, 3)
+    board.update_block_locations((0, 0), 750)
+    signature = board.board_hash()
+    player = MCTSPlayer(None, 0, PerimeterGoal(COLOUR_LIST[2]),
+                        time_limit=200)
+    path, decider = player.choose_move(board)
+    assert board.board_hash() == signature
+    assert len(board.get_block(path).children) == 4
+    assert 0 <= decider <= 3
+    assert player.last_rollouts > 0
+
+
+def test_mcts_player_root_parallel() -> None:
+    """Root parallel workers add their visit counts together."""
+    random.seed(2017)
+    board = random_init(0, 3)
+    board.update_block_locations((0, 0), 750)
+    player = MCTSPlayer(None, 0, BlobGoal(COLOUR_LIST[0]), time_limit=200,
+                        workers=2)
+    assert player.choose_move(board) is not None
+    assert player.last_rollouts > 0
+
+
+def test_smart_player_time_limit() -> None:
+    """A timed SmartPlayer reports how many moves it checked and never
+    picks a move worse than checking every move would."""
+    random.seed(148)
+    board = random_init(0, 3)
+    board.update_block_locations((0, 0), 750)
+    goal = BlobGoal(COLOUR_LIST[3])
+    player = SmartPlayer(None, 0, goal, 0, time_limit=10000)
+    block, decider = player._timed_move(board)
+    assert player.last_evaluated > 0
+
+    random_move(decider, block)
+    chosen = goal.score(board)
+    undo_move(block, decider)
+    for path, other in _search_moves(board, 1000):
+        other_block = board.get_block(path)
+        random_move(other, other_block)
+        assert goal.score(board) <= chosen
+        undo_move(other_block, other)
+
+
+def test_smart_player_tiny_time_limit() -> None:
+    """Even without any time a timed SmartPlayer checks one move."""
+    random.seed(148)
+    board = random_init(0, 4)
+    player = SmartPlayer(None, 0, PerimeterGoal(COLOUR_LIST[0]), 5,
+                         time_limit=0)
+    assert player._timed_move(board) is not None
+    assert player.last_evaluated == 1
+
+
+def test_choose_block_node_sampling() -> None:
+    """Node sampling reaches every block, including the small ones that
+    pixel sampling rarely finds."""
+    random.seed(1001)
+    board = random_init(0, 3)
+    board.update_block_locations((0, 0), 750)
+    num_blocks = len(BlockIndex(board))
+    seen = set()
+    for _ in range(50 * num_blocks):
+        seen.add(id(choose_block(board, NODE_SAMPLING)))
+    assert len(seen) == num_blocks
+
+    levels = set()
+    for _ in range(200):
+        levels.add(choose_block(board, LEVEL_SAMPLING).level)
+    assert levels == {level for level, blocks
+                      in enumerate(board.node_index.levels) if blocks}
+
+
+def test_smart_player_approximate_audit() -> None:
+    """With audit on, the approximate ranking reports how often it changed
+    the move made; at full resolution it never does."""
+    random.seed(148)
+    board = random_init(0, 4)
+    board.update_block_locations((0, 0), 750)
+    goal = BlobGoal(COLOUR_LIST[0])
+    exact = SmartPlayer(None, 0, goal, 2, top_k=3, resolution=4, audit=True)
+    coarse = SmartPlayer(None, 0, goal, 2, top_k=3, resolution=1, audit=True)
+    for _ in range(5):
+        assert exact._approximate_move(board) is not None
+        assert coarse._approximate_move(board) is not None
+    assert exact.approximate_turns == coarse.approximate_turns == 5
+    assert exact.approximate_changed == 0
+    assert 0 <= coarse.approximate_changed <= 5
+    assert coarse.last_evaluated == 3
@@ -86,7 +86,9 @@ class Renderer:
         font = pygame.font.SysFont(None, 25)
         self.displayed_image.blit(
             font.render("LMB: rotate CW           " +
-                        "RMB: rotate CCW         ",
+                        "RMB: rotate CCW         " +
+                        "U: Undo     " +
+                        "R: Redo",
                         True,
                         (255, 255, 255)), (0, BOARD_HEIGHT + 25)
         )
@@ -123,6 +125,12 @@ class Renderer:
         # updating of the pygame window.
         pygame.event.peek([])
 
+    def wait(self, milliseconds: int) -> None:
+        """Pause for the given number of <milliseconds>, so that the user can
+        see what is happening on the screen.
+        """
+        pygame.time.wait(milliseconds)
+
     # For game start
     def display_goal(self, player: 'Player') -> None:
         """Display the goal for the given player.
@@ -162,6 +170,22 @@ class Renderer:
                 if e.type == pygame.MOUSEBUTTONDOWN:
                     return
 
+class NullRenderer:
+    """
+    A renderer for headless games: it has the same methods as Renderer but
+    draws nothing, never waits, and needs no display.
+    """
+
+    def draw(self, board: 'Block', player_id: int) -> None:
+        """Do nothing, since there is no canvas to draw on."""
+
+    def wait(self, milliseconds: int) -> None:
+        """Return immediately, since there is nobody watching."""
+
+    def display_goal(self, player: 'Player') -> None:
+        """Do nothing, since there is nobody to show the goal to."""
+
+
 if __name__ == '__main__':
     import python_ta
     python_ta.check_all(config={
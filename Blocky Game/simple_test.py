@@ -14,9 +14,10 @@ tests!
 """
 from typing import List, Tuple
 from renderer import COLOUR_LIST
-from block import Block
+from block import Block, BlockIndex, random_init
 from goal import PerimeterGoal, BlobGoal
 from game import Game
+from player import TIME_DELAY
 
 
 def test_flatten() -> None:
@@ -285,6 +286,88 @@ def test_smart_player_game():
     game = Game(4, 0, 0, [1, 3, 5])
     game.run_game(3)
 
+
+def test_headless_game():
+    """
+    Put random and smart players against each other without a window and
+    ensure the game ends without pausing between moves
+    """
+    import random
+    import time
+    random.seed(1001)
+    game = Game(4, 0, 2, [1, 3], headless=True)
+    start = time.perf_counter()
+    game.run_game(3)
+    assert time.perf_counter() - start < 12 * TIME_DELAY / 1000
+
+
+def test_board_hash() -> None:
+    """Equal boards hash equally and a move changes the hash."""
+    board, _ = construct_board()
+    other, _ = construct_board()
+    assert equal_boards(board, other)
+    assert board.board_hash() == other.board_hash()
+    board.children[0].rotate(1)
+    assert board.board_hash() != other.board_hash()
+
+
+
+def test_block_copy() -> None:
+    """A copy looks the same but does not share any blocks."""
+    import random
+    random.seed(148)
+    board = random_init(0, 4)
+    board.update_block_locations((0, 0), 750)
+    copy = board.copy()
+    assert copy.board_hash() == board.board_hash()
+    assert copy.flatten() == board.flatten()
+    copy.children[0].smash()
+    assert board.children[0] is not copy.children[0]
+
+
+def test_block_index_follows_smash():
+    """A BlockIndex holds exactly the blocks of its board after smashes."""
+    import random
+    random.seed(1001)
+    board = random_init(0, 4)
+    board.update_block_locations((0, 0), 750)
+    index = BlockIndex(board)
+    assert board.node_index is index
+    for _ in range(20):
+        index.sample_block().smash()
+
+    by_level = [set() for _ in range(board.max_depth + 1)]
+    stack = [board]
+    while stack:
+        block = stack.pop()
+        by_level[block.level].add(id(block))
+        stack.extend(block.children)
+    assert len(index) == sum(len(ids) for ids in by_level)
+    for level in range(board.max_depth + 1):
+        assert {id(block) for block in index.levels[level]} == by_level[level]
+
+
+def test_coarse_flatten():
+    """A coarse flatten uses the colour covering most of each cell, and is
+    the same as flatten at full resolution."""
+    board, flatten_expected = construct_board()
+    assert board.coarse_flatten(2) == flatten_expected
+    assert board.coarse_flatten(1) == [[COLOUR_LIST[2], COLOUR_LIST[1]],
+                                       [COLOUR_LIST[1], COLOUR_LIST[3]]]
+    assert board.coarse_flatten(0) == [[COLOUR_LIST[1]]]
+
+
+def test_approximate_score():
+    """Approximate scores are exact at full resolution and scaled to unit
+    cells at lower resolutions."""
+    board, _ = construct_board()
+    for colour in COLOUR_LIST:
+        for goal in [BlobGoal(colour), PerimeterGoal(colour)]:
+            assert goal.approximate_score(board, 2) == goal.score(board)
+    assert BlobGoal(COLOUR_LIST[1]).approximate_score(board, 1) == 4
+    assert PerimeterGoal(COLOUR_LIST[3]).approximate_score(board, 1) == 4
+
+
 ###############################################################################
 # Test helpers
 ###############################################################################
@@ -0,0 +1,173 @@
+"""Assignment 2 - Blocky
+
+=== Module Description ===
+
+This file contains a tournament runner that plays many headless games
+between computer players in parallel.
+
+Each game is played in a worker process with its own random seed, so any
+game of a tournament can be played again by seeding the random module
+with its seed before creating the Game.  One JSON record per game (its
+seed, final scores, winner and the time each move took) is appended to a
+results file as soon as the game ends, and when all the games are over
+the win rate of every seat is reported with a 95% confidence interval.
+
+Run it from the command line, for example:
+
+    python tournament.py 1000 --depth 4 --random 1 --smart 1 3 5
+"""
+import argparse
+import json
+import math
+import random
+from multiprocessing import Pool
+from typing import List, Dict, Tuple, Optional
+from game import Game
+
+# The z value of a 95% confidence interval.
+CONFIDENCE_Z = 1.96
+
+
+def play_game(settings: Tuple[int, int, int, List[int], int]) -> Dict:
+    """Play one headless game and return a record of it.
+
+    <settings> holds the seed of the game, the max_depth of its board, the
+    number of random players, the difficulties of the smart players, and the
+    number of turns each player gets.
+
+    The record maps 'seed' to the seed, 'scores' to the final score of each
+    player, 'winner' to the index of the winning player (the first of the
+    players with the highest score, as reported by Game.run_game) and
+    'move_times' to [player id, seconds] pairs, one for each move.
+    """
+    seed, max_depth, random_players, smart_players, num_turns = settings
+    random.seed(seed)
+    game = Game(max_depth, 0, random_players, smart_players, headless=True)
+    scores = game.run_game(num_turns, verbose=False)
+    return {
+        'seed': seed,
+        'scores': scores,
+        'winner': scores.index(max(scores)),
+        'move_times': game.move_times
+    }
+
+
+def seat_names(random_players: int, smart_players: List[int]) -> List[str]:
+    """Return a name for each seat of a game with <random_players> random
+    players and smart players of the difficulties in <smart_players>, in the
+    order Game gives them their turns.
+    """
+    return (['random'] * random_players +
+            [f'smart-{difficulty}' for difficulty in smart_players])
+
+
+def wilson_interval(wins: int, games: int,
+                    z: float = CONFIDENCE_Z) -> Tuple[float, float]:
+    """Return the Wilson score confidence interval of a win rate of <wins>
+    out of <games>, as a (low, high) pair.
+
+    >>> wilson_interval(0, 0)
+    (0.0, 1.0)
+    >>> low, high = wilson_interval(50, 100)
+    >>> round(low, 3), round(high, 3)
+    (0.404, 0.596)
+    """
+    if games == 0:
+        return 0.0, 1.0
+    rate = wins / games
+    denominator = 1 + z * z / games
+    centre = (rate + z * z / (2 * games)) / denominator
+    spread = z * math.sqrt(rate * (1 - rate) / games +
+                           z * z / (4 * games * games)) / denominator
+    return max(0.0, centre - spread), min(1.0, centre + spread)
+
+
+def summarize(records: List[Dict], names: List[str]) -> List[Dict]:
+    """Return the statistics of each seat over the games in <records>: its
+    name, number of wins, win rate, confidence interval, mean score and mean
+    seconds per move.
+    """
+    summary = []
+    for seat in range(len(names)):
+        wins = sum(1 for record in records if record['winner'] == seat)
+        times = [seconds for record in records
+                 for player_id, seconds in record['move_times']
+                 if player_id == seat]
+        low, high = wilson_interval(wins, len(records))
+        summary.append({
+            'seat': seat,
+            'name': names[seat],
+            'wins': wins,
+            'win_rate': wins / len(records) if records else 0.0,
+            'interval': [low, high],
+            'mean_score': (sum(record['scores'][seat] for record in records) /
+                           len(records) if records else 0.0),
+            'mean_move_time': sum(times) / len(times) if times else 0.0
+        })
+    return summary
+
+
+def run_tournament(num_games: int, max_depth: int, random_players: int,
+                   smart_players: List[int], num_turns: int = 5,
+                   results_path: str = 'tournament_results.jsonl',
+                   processes: Optional[int] = None,
+                   seed: int = 0) -> List[Dict]:
+    """Play <num_games> headless games across a pool of <processes> worker
+    processes (one per core if None) and return the summary of each seat, as
+    described in summarize.
+
+    Game i is seeded with <seed> + i.  Every game is played on a board of
+    <max_depth> by <random_players> random players and smart players of the
+    difficulties in <smart_players>, for <num_turns> turns each.  The record
+    of each game (see play_game) is written to <results_path> as a line of
+    JSON as soon as it finishes, so a long tournament can be followed, or
+    stopped, while it runs.
+
+    Precondition: random_players + len(smart_players) >= 1
+    """
+    settings = [(seed + i, max_depth, random_players, smart_players,
+                 num_turns) for i in range(num_games)]
+    records = []
+    with open(results_path, 'w') as results, Pool(processes) as pool:
+        for record in pool.imap_unordered(play_game, settings):
+            results.write(json.dumps(record) + '\n')
+            results.flush()
+            records.append(record)
+    return summarize(records, seat_names(random_players, smart_players))
+
+
+def print_summary(summary: List[Dict], num_games: int) -> None:
+    """Print the <summary> of a tournament of <num_games> games."""
+    print(f'{num_games} games')
+    for seat in summary:
+        low, high = seat['interval']
+        print(f'Player {seat["seat"]} ({seat["name"]}): '
+              f'{seat["wins"]} wins, '
+              f'win rate {seat["win_rate"]:.3f} [{low:.3f}, {high:.3f}], '
+              f'mean score {seat["mean_score"]:.1f}, '
+              f'{seat["mean_move_time"] * 1000:.1f} ms per move')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Play many headless Blocky games in parallel.')
+    parser.add_argument('games', type=int, help='number of games to play')
+    parser.add_argument('--depth', type=int, default=4,
+                        help='max_depth of the boards')
+    parser.add_argument('--random', type=int, default=0,
+                        help='number of random players')
+    parser.add_argument('--smart', type=int, nargs='*', default=[],
+                        help='difficulties of the smart players')
+    parser.add_argument('--turns', type=int, default=5,
+                        help='number of turns of each player')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='number of worker processes')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the first game')
+    parser.add_argument('--results', default='tournament_results.jsonl',
+                        help='file to write the game records to')
+    args = parser.parse_args()
+
+    print_summary(run_tournament(args.games, args.depth, args.random,
+                                 args.smart, args.turns, args.results,
+                                 args.processes, args.seed), args.games)
@@ -0,0 +1,39 @@
+"""Assignment 2 - Blocky: Tournament tests
+
+=== Module Description ===
+
+This file contains tests for tournament.py.
+"""
+import json
+from tournament import run_tournament, play_game, wilson_interval
+
+
+def test_tournament_records_every_game(tmp_path) -> None:
+    """Every game is streamed to the results file and counted once."""
+    path = str(tmp_path / 'results.jsonl')
+    summary = run_tournament(4, 2, 1, [1], num_turns=2, results_path=path,
+                             processes=2, seed=7)
+    with open(path) as results:
+        records = [json.loads(line) for line in results]
+
+    assert sorted(record['seed'] for record in records) == [7, 8, 9, 10]
+    assert sum(seat['wins'] for seat in summary) == 4
+    assert [seat['name'] for seat in summary] == ['random', 'smart-1']
+    for record in records:
+        assert len(record['scores']) == 2
+        assert len(record['move_times']) == 4
+
+
+def test_tournament_games_are_reproducible() -> None:
+    """A game played again with the same seed has the same result."""
+    first = play_game((148, 3, 1, [2], 2))
+    second = play_game((148, 3, 1, [2], 2))
+    assert first['scores'] == second['scores']
+
+
+def test_wilson_interval() -> None:
+    """The interval contains the win rate and narrows with more games."""
+    low, high = wilson_interval(30, 100)
+    assert low < 0.3 < high
+    wide_low, wide_high = wilson_interval(3, 10)
+    assert wide_high - wide_low > high - low